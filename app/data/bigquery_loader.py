@@ -1,15 +1,47 @@
 """BigQuery data loading for closing totals"""
 import json
 import os
+import traceback
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime, time
 from google.cloud import bigquery
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from app.config import config
 
 # Streamlit no longer supported - removed all Streamlit code paths
 
+# Field order of the per-game tuples returned by get_closing_totals
+MARKET_DATA_COLUMNS = (
+    "closing_total",
+    "board",
+    "rotation_number",
+    "closing_1h_total",
+    "lookahead_2h_total",
+    "closing_spread_home",
+    "home_team_name",
+    "opening_2h_total",
+    "closing_2h_total",
+    "opening_2h_spread",
+    "closing_2h_spread",
+)
+
+# Expected TFS coefficients by possession start type
+# Period 1: (intercept, closing_total coef); Period 2 adds a score_diff coef
+EXPECTED_TFS_P1_COEFS = {
+    "turnover": (23.4283, -0.068865),
+    "rebound": (23.2206, -0.070364),
+    "oppo_made_shot": (35.8503, -0.105015),
+    "oppo_made_ft": (28.1118, -0.065201),
+}
+EXPECTED_TFS_P2_COEFS = {
+    "turnover": (22.0475, -0.057148, -0.061952),
+    "rebound": (24.2071, -0.072452, -0.045162),
+    "oppo_made_shot": (35.0632, -0.097778, -0.034749),
+    "oppo_made_ft": (29.7614, -0.073256, -0.030282),
+}
+
 
 def should_run_query() -> bool:
     """Determine if we should run the BigQuery query.
@@ -32,13 +64,14 @@ def should_run_query() -> bool:
 
 
 # Removed @st.cache_data decorator - caching handled by generate_cache.py script
-def _get_closing_totals_internal(game_ids: list) -> Dict[str, Tuple[float, str, Optional[int], Optional[float], Optional[float], Optional[float], Optional[str], Optional[float], Optional[float], Optional[float], Optional[float]]]:
+def _get_closing_totals_internal(game_ids: list, boards: Optional[List[str]] = None) -> Dict[str, Tuple[float, str, Optional[int], Optional[float], Optional[float], Optional[float], Optional[str], Optional[float], Optional[float], Optional[float], Optional[float]]]:
     """Internal function to fetch closing totals from BigQuery.
     
     This is cached for 1 hour. The wrapper function handles time restrictions.
     
     Args:
         game_ids: List of game ID strings
+        boards: Optional list of boards ('main', 'extra') to keep; filtered in the query
         
     Returns:
         Dictionary mapping game_id to (closing_total, board, rotation_number, closing_1h_total, lookahead_2h_total, closing_spread_home, home_team_name, opening_2h_total, closing_2h_total, opening_2h_spread, closing_2h_spread)
@@ -68,7 +101,6 @@ def _get_closing_totals_internal(game_ids: list) -> Dict[str, Tuple[float, str,
             client = bigquery.Client()
     except Exception as e:
         # Log credential loading error for debugging
-        import traceback
         print(f"ERROR: Failed to load BigQuery credentials: {e}")
         print(traceback.format_exc())
         return {}
@@ -82,6 +114,15 @@ def _get_closing_totals_internal(game_ids: list) -> Dict[str, Tuple[float, str,
         # Convert game_ids to string for SQL
         game_ids_str = ",".join([f"'{gid}'" for gid in game_ids])
         
+        # Board is derived from the rotation number, so the filter repeats that expression
+        board_filter = ""
+        if boards:
+            unknown_boards = set(boards) - {"main", "extra"}
+            if unknown_boards:
+                raise ValueError(f"Unknown board(s): {sorted(unknown_boards)}")
+            boards_str = ",".join([f"'{board}'" for board in boards])
+            board_filter = f"AND (CASE WHEN COALESCE(m.away_rotationNumber, 9999) < 1000 THEN 'main' ELSE 'extra' END) IN ({boards_str})"
+        
         query = f"""
         WITH games_after_11_1_pg AS (
           SELECT *
@@ -355,6 +396,7 @@ def _get_closing_totals_internal(game_ids: list) -> Dict[str, Tuple[float, str,
         LEFT JOIN second_half_spreads shs
           ON x.event_id = shs.eventId
         WHERE x.game_id IN ({game_ids_str})
+          {board_filter}
         ORDER BY COALESCE(m.eventStart, TIMESTAMP('1900-01-01')) DESC
         """
         
@@ -401,14 +443,13 @@ def _get_closing_totals_internal(game_ids: list) -> Dict[str, Tuple[float, str,
         
     except Exception as e:
         # Log query error for debugging
-        import traceback
         print(f"ERROR: BigQuery query failed: {e}")
         print(traceback.format_exc())
         # Return empty dict on error (fail gracefully)
         return {}
 
 
-def get_closing_totals(game_ids: list) -> Dict[str, Tuple[float, str, Optional[int], Optional[float], Optional[float], Optional[float], Optional[str], Optional[float], Optional[float], Optional[float], Optional[float]]]:
+def get_closing_totals(game_ids: list, boards: Optional[List[str]] = None) -> Dict[str, Tuple[float, str, Optional[int], Optional[float], Optional[float], Optional[float], Optional[str], Optional[float], Optional[float], Optional[float], Optional[float]]]:
     """Get closing totals, board info, rotation numbers, first half totals, lookahead 2H totals, home spreads, home team names, and second half data for a list of game IDs from BigQuery.
     
     Only runs query once per hour (via cache) and skips between 10pm-8am.
@@ -416,6 +457,7 @@ def get_closing_totals(game_ids: list) -> Dict[str, Tuple[float, str, Optional[i
     
     Args:
         game_ids: List of game ID strings
+        boards: Optional list of boards ('main', 'extra') to keep; default keeps all
         
     Returns:
         Dictionary mapping game_id to (closing_total, board, rotation_number, closing_1h_total, lookahead_2h_total, closing_spread_home, home_team_name, opening_2h_total, closing_2h_total, opening_2h_spread, closing_2h_spread)
@@ -426,20 +468,35 @@ def get_closing_totals(game_ids: list) -> Dict[str, Tuple[float, str, Optional[i
         # The cache key includes game_ids, so we need to call with the same signature
         # If cache is available, it will return it; otherwise returns empty
         try:
-            return _get_closing_totals_internal(game_ids)
+            return _get_closing_totals_internal(game_ids, boards)
         except:
             return {}
     
     # During allowed hours, run the query (will use cache if available)
-    return _get_closing_totals_internal(game_ids)
+    return _get_closing_totals_internal(game_ids, boards)
+
+
+def closing_totals_to_frame(closing_totals: Dict[str, Tuple]) -> pd.DataFrame:
+    """Convert get_closing_totals output into a columnar DataFrame.
+    
+    Args:
+        closing_totals: Dictionary returned by get_closing_totals
+        
+    Returns:
+        DataFrame indexed by game_id with one column per MARKET_DATA_COLUMNS field
+        (missing values are NaN/None; rotation_number is a nullable integer)
+    """
+    frame = pd.DataFrame.from_dict(closing_totals, orient="index", columns=list(MARKET_DATA_COLUMNS))
+    frame["rotation_number"] = frame["rotation_number"].astype("Int64")
+    return frame
 
 
 def calculate_expected_tfs(
     closing_total: float, 
-    poss_start_type: Optional[str] = None,
-    period_number: Optional[int] = None,
+    poss_start_type: Union[Optional[str], np.ndarray] = None,
+    period_number: Union[Optional[int], np.ndarray] = None,
     score_diff: Optional[float] = None
-) -> float:
+) -> Union[float, np.ndarray]:
     """Calculate expected TFS from closing total, possession start type, period, and score differential.
     
     Uses period-specific formulas:
@@ -460,18 +517,25 @@ def calculate_expected_tfs(
     If period_number is 2 or greater and score_diff is provided, uses Period 2 formulas.
     Otherwise falls back to Period 1 formulas.
     
+    poss_start_type may also be a NumPy array (one entry per possession, with
+    None/NaN for missing types), in which case period_number may be a matching
+    array and an array of expected TFS values is returned.
+    
     Args:
         closing_total: Closing total from betting market (will be converted to float)
-        poss_start_type: Possession start type (optional)
+        poss_start_type: Possession start type (optional), or an array of them
         period_number: Period number (1, 2, etc.) - optional, defaults to Period 1
         score_diff: Score differential at end of Period 1 (abs(away_score - home_score)) - optional, required for Period 2
         
     Returns:
-        Expected TFS value
+        Expected TFS value (array of values for array input)
     """
     # Ensure closing_total is a float
     closing_total = float(closing_total)
     
+    if isinstance(poss_start_type, np.ndarray):
+        return _calculate_expected_tfs_array(closing_total, poss_start_type, period_number, score_diff)
+    
     # Determine which period formulas to use
     # Default to Period 1 if period_number is None or 1
     use_period_2 = (period_number is not None and period_number >= 2 and score_diff is not None)
@@ -480,35 +544,61 @@ def calculate_expected_tfs(
     if poss_start_type:
         poss_start_type = str(poss_start_type).lower()
         
+        # Unknown types use the rebound formula as default
         if use_period_2:
             # Period 2 formulas (with score_diff)
-            score_diff = float(score_diff)
-            
-            if poss_start_type == "turnover":
-                return 22.0475 + (-0.057148 * closing_total) + (-0.061952 * score_diff)
-            elif poss_start_type == "rebound":
-                return 24.2071 + (-0.072452 * closing_total) + (-0.045162 * score_diff)
-            elif poss_start_type == "oppo_made_shot":
-                return 35.0632 + (-0.097778 * closing_total) + (-0.034749 * score_diff)
-            elif poss_start_type == "oppo_made_ft":
-                return 29.7614 + (-0.073256 * closing_total) + (-0.030282 * score_diff)
-            else:
-                # Unknown type, use rebound formula as default
-                return 24.2071 + (-0.072452 * closing_total) + (-0.045162 * score_diff)
+            intercept, total_coef, diff_coef = EXPECTED_TFS_P2_COEFS.get(poss_start_type, EXPECTED_TFS_P2_COEFS["rebound"])
+            return intercept + (total_coef * closing_total) + (diff_coef * float(score_diff))
         else:
             # Period 1 formulas
-            if poss_start_type == "turnover":
-                return 23.4283 + (-0.068865 * closing_total)
-            elif poss_start_type == "rebound":
-                return 23.2206 + (-0.070364 * closing_total)
-            elif poss_start_type == "oppo_made_shot":
-                return 35.8503 + (-0.105015 * closing_total)
-            elif poss_start_type == "oppo_made_ft":
-                return 28.1118 + (-0.065201 * closing_total)
-            else:
-                # Unknown type, use rebound formula as default
-                return 23.2206 + (-0.070364 * closing_total)
+            intercept, total_coef = EXPECTED_TFS_P1_COEFS.get(poss_start_type, EXPECTED_TFS_P1_COEFS["rebound"])
+            return intercept + (total_coef * closing_total)
     
     # Fallback to old game-level formula if no poss_start_type
     return 27.65 - 0.08 * closing_total
 
+
+def _calculate_expected_tfs_array(
+    closing_total: float,
+    poss_start_type: np.ndarray,
+    period_number: Union[Optional[int], np.ndarray],
+    score_diff: Optional[float]
+) -> np.ndarray:
+    """Array version of calculate_expected_tfs, applying each formula by mask.
+    
+    Args:
+        closing_total: Closing total from betting market
+        poss_start_type: Array of possession start types (None/NaN where missing)
+        period_number: Period number, or array of them (NaN treated as Period 1)
+        score_diff: Score differential at end of Period 1 - optional, required for Period 2
+        
+    Returns:
+        Array of expected TFS values
+    """
+    types = pd.Series(poss_start_type, dtype=object)
+    has_type = (types.notna() & (types != "")).to_numpy()
+    types = types.astype(str).str.lower().to_numpy(dtype=object)
+    
+    if period_number is None or score_diff is None:
+        use_period_2 = np.zeros(len(types), dtype=bool)
+    else:
+        period_number = np.broadcast_to(np.asarray(period_number, dtype=float), types.shape)
+        use_period_2 = np.nan_to_num(period_number, nan=0.0) >= 2
+    use_period_1 = has_type & ~use_period_2
+    use_period_2 &= has_type
+    
+    # Game-level formula where there is no type, rebound formula for unknown types
+    expected = np.full(len(types), 27.65 - 0.08 * closing_total)
+    intercept, total_coef = EXPECTED_TFS_P1_COEFS["rebound"]
+    expected[use_period_1] = intercept + (total_coef * closing_total)
+    if use_period_2.any():
+        intercept, total_coef, diff_coef = EXPECTED_TFS_P2_COEFS["rebound"]
+        expected[use_period_2] = intercept + (total_coef * closing_total) + (diff_coef * float(score_diff))
+    
+    for poss_type, (intercept, total_coef) in EXPECTED_TFS_P1_COEFS.items():
+        expected[use_period_1 & (types == poss_type)] = intercept + (total_coef * closing_total)
+    if use_period_2.any():
+        for poss_type, (intercept, total_coef, diff_coef) in EXPECTED_TFS_P2_COEFS.items():
+            expected[use_period_2 & (types == poss_type)] = intercept + (total_coef * closing_total) + (diff_coef * float(score_diff))
+    
+    return expected
@@ -12,6 +12,29 @@ import pandas as pd
 import os
 
 
+# Columns of the per-play records built from the API response (in order)
+PLAY_COLUMNS = [
+    "id",
+    "sequence_number",
+    "type_id",
+    "type_text",
+    "text",
+    "away_score",
+    "home_score",
+    "period_number",
+    "clock_value",
+    "scoring_play",
+    "shooting_play",
+    "score_value",
+    "valid",
+    "priority",
+    "modified",
+    "team_id",
+    "team_name",
+    "team_abbrev",
+]
+
+
 def get_json(url: str):
     """Helper to safely get JSON from a given ESPN Core API $ref URL."""
     r = requests.get(url)
@@ -61,58 +84,52 @@ def get_pbp(game_id: int) -> pd.DataFrame:
         print("No play data found.")
         return pd.DataFrame()
 
+    # Build plain tuples (ordered as PLAY_COLUMNS) rather than one dict per play;
+    # the DataFrame is constructed once from the records at the end
     rows = []
     team_cache = {}
+    no_team = (None, None, None)
 
     for play in plays:
-        row = {
-            "id": play.get("id"),
-            "sequence_number": play.get("sequenceNumber"),
-            "type_id": play.get("type", {}).get("id"),
-            "type_text": play.get("type", {}).get("text"),
-            "text": play.get("text"),
-            "away_score": play.get("awayScore"),
-            "home_score": play.get("homeScore"),
-            "period_number": play.get("period", {}).get("number"),
-            "clock_value": play.get("clock", {}).get("value"),
-            "scoring_play": play.get("scoringPlay"),
-            "shooting_play": play.get("shootingPlay"),
-            "score_value": play.get("scoreValue"),
-            "valid": play.get("valid"),
-            "priority": play.get("priority"),
-            "modified": play.get("modified"),
-        }
-
-        # Fetch and unpack team info
+        play_type = play.get("type", {})
+        row = (
+            play.get("id"),
+            play.get("sequenceNumber"),
+            play_type.get("id"),
+            play_type.get("text"),
+            play.get("text"),
+            play.get("awayScore"),
+            play.get("homeScore"),
+            play.get("period", {}).get("number"),
+            play.get("clock", {}).get("value"),
+            play.get("scoringPlay"),
+            play.get("shootingPlay"),
+            play.get("scoreValue"),
+            play.get("valid"),
+            play.get("priority"),
+            play.get("modified"),
+        )
+
+        # Fetch and unpack team info (team_id, team_name, team_abbrev)
         team_ref = play.get("team", {}).get("$ref")
         if team_ref:
             if team_ref not in team_cache:
                 try:
                     team_data = get_json(team_ref)
-                    team_cache[team_ref] = {
-                        "team_id": team_data.get("id"),
+                    team_cache[team_ref] = (
+                        team_data.get("id"),
                         # Use location instead of displayName
-                        "team_name": team_data.get("location"),
-                        "team_abbrev": team_data.get("abbreviation"),
-                    }
+                        team_data.get("location"),
+                        team_data.get("abbreviation"),
+                    )
                 except Exception as e:
                     print(f"Warning: could not fetch team info for {team_ref}: {e}")
-                    team_cache[team_ref] = {
-                        "team_id": None,
-                        "team_name": None,
-                        "team_abbrev": None,
-                    }
-            row.update(team_cache[team_ref])
+                    team_cache[team_ref] = no_team
+            rows.append(row + team_cache[team_ref])
         else:
-            row.update({
-                "team_id": None,
-                "team_name": None,
-                "team_abbrev": None,
-            })
-
-        rows.append(row)
+            rows.append(row + no_team)
 
-    df = pd.DataFrame(rows)
+    df = pd.DataFrame.from_records(rows, columns=PLAY_COLUMNS)
 
     # Ensure boolean fields remain native bools (fill nulls with False)
     bool_cols = ["scoring_play", "shooting_play"]
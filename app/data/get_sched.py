@@ -45,22 +45,6 @@ def get_sched():
         for e in data.get("events", []):
             game_id = e.get("id")
             game_date_time = e.get("date")
-            
-            # Convert game_date_time to PST and extract date
-            if game_date_time:
-                # Parse the datetime string (ESPN provides ISO format, typically UTC)
-                try:
-                    # Parse as UTC first (ESPN dates are typically in UTC)
-                    dt_utc = pd.to_datetime(game_date_time, utc=True)
-                    # Convert to PST (UTC-8)
-                    dt_pst = dt_utc.tz_convert(pst)
-                    # Extract date in PST
-                    game_date = dt_pst.date()
-                except Exception:
-                    # Fallback: just use the date part if parsing fails
-                    game_date = game_date_time.split("T")[0] if game_date_time else None
-            else:
-                game_date = None
 
             away_team = home_team = None
             away_team_id = home_team_id = None
@@ -83,7 +67,7 @@ def get_sched():
 
             rows.append({
                 "game_id": game_id,
-                "game_date": game_date,
+                "game_date": None,  # Filled in below for all rows at once
                 "game_date_time": game_date_time,
                 "away_team_id": away_team_id,
                 "home_team_id": home_team_id,
@@ -96,9 +80,12 @@ def get_sched():
     # === Build DataFrame ===
     df = pd.DataFrame(rows).drop_duplicates(subset=["game_id"])
     
-    # Convert game_date to datetime for sorting
-    # game_date is already a date object (PST date), convert to datetime for DataFrame operations
-    df["game_date"] = pd.to_datetime(df["game_date"], errors="coerce")
+    # Convert game_date_time to PST and extract date (as a midnight datetime for sorting) in one vectorized pass
+    # Parse as UTC first (ESPN provides ISO format, typically UTC), then convert to PST (UTC-8)
+    dt_pst = pd.to_datetime(df["game_date_time"], utc=True, errors="coerce").dt.tz_convert(pst)
+    # Fallback: just use the date part if parsing fails
+    raw_dates = pd.to_datetime(df["game_date_time"].str.split("T").str[0], errors="coerce")
+    df["game_date"] = dt_pst.dt.tz_localize(None).dt.normalize().where(dt_pst.notna(), raw_dates)
     
     df = df.sort_values("game_date").reset_index(drop=True)
     return df
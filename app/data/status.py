@@ -1,4 +1,5 @@
 """Game status classification based on play-by-play data"""
+import numpy as np
 import pandas as pd
 from typing import Literal
 
@@ -29,18 +30,16 @@ def classify_game_status_pbp(df: pd.DataFrame) -> GameStatus:
     if "period_number" not in df.columns:
         return "Not Started"
     
-    # Filter out rows with missing period_number
-    df = df[df["period_number"].notna()].copy()
+    # Work on plain float arrays: only the latest period and its lowest clock
+    # value matter, so the rows never need to be copied or sorted
+    period_values = df["period_number"].to_numpy(dtype=float, na_value=np.nan)
+    has_period = ~np.isnan(period_values)
     
-    if len(df) == 0:
+    if not has_period.any():
         return "Not Started"
     
-    periods = df["period_number"].unique()
-    
-    if len(periods) == 0:
-        return "Not Started"
-    
-    max_period = int(periods.max())
+    period_values = period_values[has_period]
+    max_period = int(period_values.max())
     
     # Check if game has clock information
     if "clock_value" not in df.columns:
@@ -52,23 +51,17 @@ def classify_game_status_pbp(df: pd.DataFrame) -> GameStatus:
         else:
             return "Complete"
     
-    # Sort by period and clock (descending) to get most recent plays first
-    # Clock counts down, so lower values = more recent
-    df_sorted = df.sort_values(
-        by=["period_number", "clock_value", "sequence_number"],
-        ascending=[True, True, True]  # Period asc, clock asc (lowest = most recent), sequence asc
-    )
+    clock_values = df["clock_value"].to_numpy(dtype=float, na_value=np.nan)[has_period]
     
     # Period 1 logic
     if max_period == 1:
-        # Get period 1 data and find the most recent clock value (minimum)
-        period1_data = df_sorted[df_sorted["period_number"] == 1]
-        if len(period1_data) == 0:
+        in_period = period_values == 1
+        if not in_period.any():
             return "Not Started"
         
-        # Get the minimum clock value (most recent play in period 1)
-        # Filter out None/NaN values
-        period1_clocks = period1_data["clock_value"].dropna()
+        # Clock counts down, so the minimum clock value is the most recent play
+        period1_clocks = clock_values[in_period]
+        period1_clocks = period1_clocks[~np.isnan(period1_clocks)]
         if len(period1_clocks) == 0:
             return "Not Started"
         
@@ -87,13 +80,14 @@ def classify_game_status_pbp(df: pd.DataFrame) -> GameStatus:
     # Period 2 logic
     elif max_period == 2:
         # Check if period 2 has started (has any plays in period 2)
-        period2_data = df_sorted[df_sorted["period_number"] == 2]
-        if len(period2_data) == 0:
+        in_period = period_values == 2
+        if not in_period.any():
             # Period 1 ended but period 2 not started = Halftime
             return "Halftime"
         
         # Get the minimum clock value from period 2 (most recent play)
-        period2_clocks = period2_data["clock_value"].dropna()
+        period2_clocks = clock_values[in_period]
+        period2_clocks = period2_clocks[~np.isnan(period2_clocks)]
         if len(period2_clocks) == 0:
             # No valid clock data, assume second half if period 2 exists
             return "Second Half"
@@ -108,4 +102,3 @@ def classify_game_status_pbp(df: pd.DataFrame) -> GameStatus:
     # Period > 2 = Complete
     else:
         return "Complete"
-
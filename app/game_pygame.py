@@ -7,18 +7,49 @@ Usage:
     python -m app.game_pygame
 """
 import pygame
+import os
 import sys
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pickle
-from PIL import Image
+import queue
+import threading
 import time
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Constants
 CACHE_DIR = Path("cache/plots")
+RESIDUALS_INDEX_FILE = CACHE_DIR / "residuals.json"  # Combined residual data written by generate_cache.py
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 900
 FLASH_DURATION_MS = 100  # 100ms flash
+RESULT_DELAY_MS = 100  # Delay before showing result text
+AUTO_ADVANCE_MS = 1500  # Delay before moving on to the next game
+FLASH_COLOR_FASTER = (0, 200, 0)  # Green: P2 faster than expected
+FLASH_COLOR_SLOWER = (200, 0, 0)  # Red: P2 slower than expected
+IDLE_WAIT_MS = 200  # Max time the main loop blocks waiting for input
+TEXT_CACHE_SIZE = 64  # Max rendered dynamic text surfaces kept in memory
+IMAGE_CACHE_SIZE = 4  # Max decoded plot images kept in memory
+RESIDUAL_LOAD_WORKERS = 8  # Threads used to read residual files at startup
+
+# Screen regions used for dirty-rect updates
+FULL_RECT = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+CONTROLS_RECT = pygame.Rect(0, WINDOW_HEIGHT - 140, WINDOW_WIDTH, 140)  # Buttons / result text
+
+
+class GameState:
+    """Per-game prediction state."""
+    
+    __slots__ = ('prediction_made', 'user_prediction', 'actual_result', 'correctness', 'result_show_time')
+    
+    def __init__(self):
+        self.prediction_made: bool = False
+        self.user_prediction: Optional[str] = None
+        self.actual_result: Optional[str] = None  # "slow" or "fast", set once the prediction is scored
+        self.correctness: Optional[bool] = None
+        self.result_show_time: int = 0
 
 
 class HalftimeGame:
@@ -29,102 +60,308 @@ class HalftimeGame:
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Halftime Game 🏀")
         
+        # Batch blitter: pygame-ce's fblits if available, else blits without return rects
+        if hasattr(self.screen, 'fblits'):
+            self._blit_many = self.screen.fblits
+        else:
+            self._blit_many = lambda draws: self.screen.blits(draws, doreturn=False)
+        
         # Game state
         self.game_ids = self._get_all_cached_games()
-        self.residual_data = self._load_all_residual_data(self.game_ids)
-        self.cached_images = self._preload_images()
+        # Outcomes never change, so resolve each game's result and flash colour once:
+        # p_value_p2 > 0.5 means Period 2 was SLOWER than expected, < 0.5 means FASTER
+        self.outcomes: Dict[str, Tuple[str, Tuple[int, int, int]]] = {
+            game_id: (
+                "slow" if p_value_p2 > 0.5 else "fast",
+                FLASH_COLOR_FASTER if p_value_p2 < 0.5 else FLASH_COLOR_SLOWER,
+            )
+            for game_id, p_value_p2 in self._load_all_residual_data(self.game_ids).items()
+        }
+        # Plot images are decoded on demand; only a small working set stays resident
+        self.cached_images: "OrderedDict[str, Optional[Tuple[pygame.Surface, int, int]]]" = OrderedDict()
+        # The next game's plot is decoded on a worker thread while the current one is shown
+        self._prefetch_requests: "queue.Queue[str]" = queue.Queue()
+        self._prefetch_results: "queue.Queue[Tuple[str, Optional[Tuple[pygame.Surface, int, int]]]]" = queue.Queue()
+        self._prefetch_pending: set = set()
         
         self.current_game_index = 0
-        self.score_tally = {'correct': 0, 'total': 0}
-        self.game_states: Dict[str, dict] = {}
+        self.score_correct = 0
+        self.score_total = 0
+        self.game_states: Dict[str, GameState] = {}
         
         # Flash state
         self.flash_active = False
         self.flash_color = None
         self.flash_start_time = 0
         
+        # Flash overlays are static, so build them once per color
+        self._flash_surfs: Dict[Tuple[int, int, int], pygame.Surface] = {}
+        for color in (FLASH_COLOR_FASTER, FLASH_COLOR_SLOWER):
+            flash_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+            flash_surface.set_alpha(38)  # ~15% opacity (38/255)
+            flash_surface.fill(color)
+            self._flash_surfs[color] = flash_surface
+        
+        # Redraw state: screen regions that changed since the last draw
+        self._dirty_rects: List[pygame.Rect] = [FULL_RECT]
+        self._result_reveal_time: Optional[int] = None
+        self._advance_at: Optional[int] = None
+        
         # Fonts
         self.font_large = pygame.font.Font(None, 48)
         self.font_medium = pygame.font.Font(None, 36)
         self.font_small = pygame.font.Font(None, 24)
+        self._prerender_static_text()
+        self._text_cache: Dict[tuple, pygame.Surface] = {}
         
         if not self.game_ids:
             print("ERROR: No cached plots found. Please run `python scripts/generate_cache.py` first.")
             sys.exit(1)
+        
+        threading.Thread(target=self._prefetch_worker, daemon=True).start()
+        self._prefetch_next()
+    
+    def _prerender_static_text(self):
+        """Render constant strings and lay out the buttons once so _draw only has to blit them."""
+        button_y = WINDOW_HEIGHT - 100
+        button_width = 200
+        button_height = 60
+        self._slow_rect = pygame.Rect(WINDOW_WIDTH // 2 - 220, button_y, button_width, button_height)
+        self._fast_rect = pygame.Rect(WINDOW_WIDTH // 2 + 20, button_y, button_width, button_height)
+        
+        self._title_surf = self.font_large.render("Halftime Game 🏀", True, (0, 0, 0)).convert_alpha()
+        self._title_pos = (20, 20)
+        
+        self._slow_label_surf = self.font_medium.render("🐌 Slow (←)", True, (255, 255, 255)).convert_alpha()
+        self._slow_label_pos = self._slow_label_surf.get_rect(center=self._slow_rect.center).topleft
+        
+        self._fast_label_surf = self.font_medium.render("⚡ Fast (→)", True, (255, 255, 255)).convert_alpha()
+        self._fast_label_pos = self._fast_label_surf.get_rect(center=self._fast_rect.center).topleft
+        
+        self._instructions_surf = self.font_small.render("Press ← for Slow, → for Fast", True, (100, 100, 100)).convert_alpha()
+        self._instructions_pos = (WINDOW_WIDTH // 2 - 150, button_y - 30)
+    
+    def _render(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Render dynamic text, reusing the surface while the string is unchanged."""
+        key = (id(font), text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = font.render(text, True, color).convert_alpha()
+            if len(self._text_cache) >= TEXT_CACHE_SIZE:
+                # Evict the oldest entry (dicts preserve insertion order)
+                del self._text_cache[next(iter(self._text_cache))]
+            self._text_cache[key] = surface
+        return surface
     
     def _get_all_cached_games(self) -> list:
         """Get all game IDs from cache."""
         if not CACHE_DIR.exists():
             return []
         
-        game_ids = set()
-        for png_file in CACHE_DIR.glob("*.png"):
-            if png_file.name.endswith('_residuals.png'):
-                continue
-            game_id = png_file.stem
-            game_ids.add(game_id)
+        # Every PNG is a plot (residual data is stored as .json); listdir
+        # returns plain names, no Path or DirEntry object per directory entry
+        game_ids = {name[:-4] for name in os.listdir(CACHE_DIR) if name.endswith('.png')}
         
-        return sorted(list(game_ids))
+        return sorted(game_ids)
     
-    def _load_all_residual_data(self, game_ids: list) -> dict:
-        """Load all residual data files."""
-        residuals = {}
-        for game_id in game_ids:
-            pkl_path = CACHE_DIR / f"{game_id}_residuals.pkl"
-            if pkl_path.exists():
-                try:
-                    with open(pkl_path, 'rb') as f:
-                        residuals[game_id] = pickle.load(f)
-                except Exception as e:
-                    print(f"Error loading residual data for {game_id}: {e}")
-        return residuals
+    def _load_all_residual_data(self, game_ids: list) -> Dict[str, float]:
+        """Load the P2 p-value for each game.
+        
+        Reads the combined `residuals.json` index in one go when present.
+        Games missing from it fall back to their own `{game_id}_residuals.json`
+        (or the legacy `.pkl`), read on a small thread pool.
+        Only `p_value_p2` is used by the game, so the rest is discarded.
+        
+        Returns:
+            Dictionary mapping game_id to p_value_p2 (games without one are omitted)
+        """
+        p_values = {}
+        indexed = set()
+        if RESIDUALS_INDEX_FILE.exists():
+            try:
+                with open(RESIDUALS_INDEX_FILE, 'r') as f:
+                    index = json.load(f)
+                for game_id in game_ids:
+                    if game_id in index:
+                        indexed.add(game_id)
+                        p_value_p2 = self._extract_p_value_p2(index[game_id])
+                        if p_value_p2 is not None:
+                            p_values[game_id] = p_value_p2
+            except Exception as e:
+                print(f"Error loading residual index: {e}")
+                p_values, indexed = {}, set()
+        
+        remaining = [game_id for game_id in game_ids if game_id not in indexed]
+        if remaining:
+            with ThreadPoolExecutor(max_workers=RESIDUAL_LOAD_WORKERS) as executor:
+                for game_id, p_value_p2 in zip(remaining, executor.map(self._load_p_value_p2, remaining)):
+                    if p_value_p2 is not None:
+                        p_values[game_id] = p_value_p2
+        return p_values
     
-    def _preload_images(self) -> dict:
-        """Preload all plot images into memory."""
-        images = {}
-        for game_id in self.game_ids:
-            plot_path = CACHE_DIR / f"{game_id}.png"
-            if plot_path.exists():
-                try:
-                    # Load image directly with pygame (faster)
-                    try:
-                        img_surface = pygame.image.load(str(plot_path))
-                        images[game_id] = img_surface
-                    except pygame.error:
-                        # Fallback: use PIL if pygame can't load it
-                        pil_img = Image.open(plot_path)
-                        if pil_img.mode != 'RGB':
-                            pil_img = pil_img.convert('RGB')
-                        # Convert PIL to pygame via numpy
-                        import numpy as np
-                        img_array = np.array(pil_img)
-                        img_surface = pygame.surfarray.make_surface(img_array.swapaxes(0, 1))
-                        images[game_id] = img_surface
-                except Exception as e:
-                    print(f"Error loading image for {game_id}: {e}")
-        return images
+    @staticmethod
+    def _extract_p_value_p2(residual_data: Optional[dict]) -> Optional[float]:
+        """Pull p_value_p2 out of one game's residual data, if it has one."""
+        p_value_p2 = residual_data.get('p_value_p2') if residual_data else None
+        return float(p_value_p2) if p_value_p2 is not None else None
     
-    def _get_game_state(self, game_id: str) -> dict:
-        """Get or create game state."""
-        if game_id not in self.game_states:
-            self.game_states[game_id] = {
-                'prediction_made': False,
-                'user_prediction': None,
-                'correctness': None
-            }
-        return self.game_states[game_id]
+    def _load_p_value_p2(self, game_id: str) -> Optional[float]:
+        """Read p_value_p2 from one game's residual data file, or None if unavailable."""
+        json_path = CACHE_DIR / f"{game_id}_residuals.json"
+        pkl_path = CACHE_DIR / f"{game_id}_residuals.pkl"
+        try:
+            if json_path.exists():
+                with open(json_path, 'r') as f:
+                    residual_data = json.load(f)
+            elif pkl_path.exists():
+                with open(pkl_path, 'rb') as f:
+                    residual_data = pickle.load(f)
+            else:
+                return None
+            return self._extract_p_value_p2(residual_data)
+        except Exception as e:
+            print(f"Error loading residual data for {game_id}: {e}")
+            return None
     
-    def _calculate_correctness(self, user_prediction: str, residual_data: dict) -> Tuple[bool, str]:
-        """Calculate if user prediction was correct.
+    def _get_image(self, game_id: str) -> Optional[Tuple[pygame.Surface, int, int]]:
+        """Get the display-ready plot image for a game, loading it on first use.
         
-        Uses p_value_p2 to determine fast/slow:
-        - p_value_p2 > 0.5 means Period 2 was SLOWER than expected
-        - p_value_p2 < 0.5 means Period 2 was FASTER than expected
+        Keeps at most IMAGE_CACHE_SIZE images in memory (least recently used
+        are evicted), so startup cost and memory don't grow with the cache.
         """
-        p_value_p2 = residual_data.get('p_value_p2', 0.5)
-        actual_result = "slow" if p_value_p2 > 0.5 else "fast"
-        is_correct = (user_prediction == actual_result)
-        return is_correct, actual_result
+        self._drain_prefetched()
+        if game_id in self.cached_images:
+            self.cached_images.move_to_end(game_id)
+            return self.cached_images[game_id]
+        
+        # Not prefetched (or still decoding) - load it here rather than wait
+        image = self._to_display_format(self._decode_image(game_id))
+        self._store_image(game_id, image)
+        return image
+    
+    def _store_image(self, game_id: str, image: Optional[Tuple[pygame.Surface, int, int]]):
+        """Add an image to the LRU cache, evicting the oldest beyond IMAGE_CACHE_SIZE."""
+        self.cached_images[game_id] = image
+        self.cached_images.move_to_end(game_id)
+        if len(self.cached_images) > IMAGE_CACHE_SIZE:
+            self.cached_images.popitem(last=False)
+    
+    def _prefetch_next(self):
+        """Queue the game after the current one for background decoding."""
+        next_game_id = self.game_ids[(self.current_game_index + 1) % len(self.game_ids)]
+        if next_game_id in self.cached_images or next_game_id in self._prefetch_pending:
+            return
+        self._prefetch_pending.add(next_game_id)
+        self._prefetch_requests.put(next_game_id)
+    
+    def _prefetch_worker(self):
+        """Decode requested plots off the main thread (runs as a daemon thread)."""
+        while True:
+            game_id = self._prefetch_requests.get()
+            self._prefetch_results.put((game_id, self._decode_image(game_id)))
+    
+    def _drain_prefetched(self):
+        """Move images finished by the prefetch worker into the cache."""
+        while True:
+            try:
+                game_id, image = self._prefetch_results.get_nowait()
+            except queue.Empty:
+                return
+            self._prefetch_pending.discard(game_id)
+            if game_id not in self.cached_images:
+                self._store_image(game_id, self._to_display_format(image))
+    
+    def _decode_image(self, game_id: str) -> Optional[Tuple[pygame.Surface, int, int]]:
+        """Load a plot image from disk, pre-scaled for display.
+        
+        Only touches the surface itself, so it is safe to call from the
+        prefetch thread; _to_display_format finishes it on the main thread.
+        """
+        plot_path = CACHE_DIR / f"{game_id}.png"
+        if plot_path.exists():
+            try:
+                # pygame's SDL_image decodes PNG natively; unreadable files are logged and skipped
+                img_surface = pygame.image.load(str(plot_path))
+                return self._fit_to_window(img_surface)
+            except Exception as e:
+                print(f"Error loading image for {game_id}: {e}")
+        return None
+    
+    @staticmethod
+    def _to_display_format(image: Optional[Tuple[pygame.Surface, int, int]]) -> Optional[Tuple[pygame.Surface, int, int]]:
+        """Convert a decoded image to the display pixel format so per-frame blits skip conversion."""
+        if image is None:
+            return None
+        scaled_img, x_offset, y_offset = image
+        # Plots are opaque, so convert() rather than convert_alpha()
+        return scaled_img.convert(), x_offset, y_offset
+    
+    def _fit_to_window(self, img_surface: pygame.Surface) -> Tuple[pygame.Surface, int, int]:
+        """Scale an image once to fit the plot area (maintain aspect ratio).
+        
+        Window size is fixed, so the scaled surface and its offsets can be
+        computed at load time instead of on every frame.
+        
+        Returns:
+            Tuple of (scaled_surface, x_offset, y_offset)
+        """
+        if img_surface.get_bitsize() < 24:
+            # Cached plots are palette PNGs, which load as 8-bit surfaces; smoothscale needs 24/32-bit.
+            # Converting by depth (not to the display format) keeps this safe on the prefetch thread.
+            img_surface = img_surface.convert(24)
+        img_width, img_height = img_surface.get_size()
+        scale = min((WINDOW_WIDTH - 40) / img_width, (WINDOW_HEIGHT - 200) / img_height)
+        new_width = int(img_width * scale)
+        new_height = int(img_height * scale)
+        if (new_width, new_height) == (img_width, img_height):
+            # Already the target size - nothing to resample
+            scaled_img = img_surface
+        else:
+            scaled_img = pygame.transform.smoothscale(img_surface, (new_width, new_height))
+        
+        # Center image
+        x_offset = (WINDOW_WIDTH - new_width) // 2
+        y_offset = 160
+        return scaled_img, x_offset, y_offset
+    
+    def _mark_dirty(self, rect: pygame.Rect = FULL_RECT):
+        """Schedule a screen region for redraw on the next frame."""
+        self._dirty_rects.append(rect)
+    
+    def _update_timers(self):
+        """Apply timed UI changes (flash end, result reveal, auto-advance) that are due."""
+        now = pygame.time.get_ticks()
+        
+        if self.flash_active and now - self.flash_start_time >= FLASH_DURATION_MS:
+            self.flash_active = False
+            self._mark_dirty()  # Remove the full-window overlay
+        
+        if self._result_reveal_time is not None and now >= self._result_reveal_time:
+            self._result_reveal_time = None
+            self._mark_dirty(CONTROLS_RECT)
+        
+        if self._advance_at is not None and now >= self._advance_at:
+            self._advance_to_next_game()
+    
+    def _next_wait_ms(self) -> int:
+        """How long the main loop may block before a timed UI change is due."""
+        deadlines = []
+        if self.flash_active:
+            deadlines.append(self.flash_start_time + FLASH_DURATION_MS)
+        if self._result_reveal_time is not None:
+            deadlines.append(self._result_reveal_time)
+        if self._advance_at is not None:
+            deadlines.append(self._advance_at)
+        if not deadlines:
+            return IDLE_WAIT_MS
+        return max(1, min(min(deadlines) - pygame.time.get_ticks(), IDLE_WAIT_MS))
+    
+    def _get_game_state(self, game_id: str) -> GameState:
+        """Get or create game state."""
+        game_state = self.game_states.get(game_id)
+        if game_state is None:
+            game_state = self.game_states[game_id] = GameState()
+        return game_state
     
     def _handle_prediction(self, prediction: str):
         """Handle user prediction (fast or slow)."""
@@ -133,36 +370,39 @@ class HalftimeGame:
         
         current_game_id = self.game_ids[self.current_game_index]
         game_state = self._get_game_state(current_game_id)
-        residual_data = self.residual_data.get(current_game_id)
+        outcome = self.outcomes.get(current_game_id)
         
-        if game_state['prediction_made']:
+        if game_state.prediction_made:
             return  # Already made prediction
         
-        game_state['user_prediction'] = prediction
-        game_state['prediction_made'] = True
+        game_state.user_prediction = prediction
+        game_state.prediction_made = True
         
-        if residual_data and residual_data.get('p_value_p2') is not None:
-            # Calculate correctness
-            is_correct, actual_result = self._calculate_correctness(prediction, residual_data)
-            game_state['correctness'] = is_correct
+        if outcome is not None:
+            actual_result, flash_color = outcome
+            is_correct = (prediction == actual_result)
+            game_state.actual_result = actual_result
+            game_state.correctness = is_correct
             
             # Update score
-            self.score_tally['total'] += 1
+            self.score_total += 1
             if is_correct:
-                self.score_tally['correct'] += 1
+                self.score_correct += 1
             
             # Flash screen with color based on P2 result
-            p_value_p2 = residual_data.get('p_value_p2', 0.5)
-            flash_color = (0, 200, 0) if p_value_p2 < 0.5 else (200, 0, 0)  # Green for faster, red for slower
+            now = pygame.time.get_ticks()
             self.flash_active = True
             self.flash_color = flash_color
-            self.flash_start_time = pygame.time.get_ticks()
+            self.flash_start_time = now
             
             # Set timestamp for showing result text (100ms delay)
-            game_state['result_show_time'] = pygame.time.get_ticks() + 100
+            game_state.result_show_time = now + RESULT_DELAY_MS
+            self._result_reveal_time = game_state.result_show_time
             
-            # Auto-advance after showing result
-            pygame.time.set_timer(pygame.USEREVENT, 1500)  # Advance after 1.5 seconds
+            # Auto-advance after showing result; checked by the main loop
+            self._advance_at = now + AUTO_ADVANCE_MS
+        
+        self._mark_dirty()
     
     def _advance_to_next_game(self):
         """Move to next game."""
@@ -173,122 +413,119 @@ class HalftimeGame:
             self.current_game_index = 0
             # Reset game states for replay
             self.game_states = {}
-            self.score_tally = {'correct': 0, 'total': 0}
+            self.score_correct = 0
+            self.score_total = 0
+        
+        self._result_reveal_time = None
+        self._advance_at = None
+        self._prefetch_next()
+        self._mark_dirty()
     
-    def _draw(self):
-        """Draw everything to screen."""
+    def _draw(self) -> List[pygame.Rect]:
+        """Draw everything to the back buffer.
+        
+        Returns:
+            List of screen regions that changed and need to be pushed to the display
+        """
+        dirty_rects, self._dirty_rects = self._dirty_rects, []
         self.screen.fill((255, 255, 255))  # White background
         
         if self.current_game_index >= len(self.game_ids):
-            return
+            return dirty_rects
         
         current_game_id = self.game_ids[self.current_game_index]
         game_state = self._get_game_state(current_game_id)
-        residual_data = self.residual_data.get(current_game_id)
+        
+        # Surfaces are collected and blitted in batches; a batch is flushed
+        # before any pygame.draw call that must appear on top of it
+        draws = []
         
         # Draw title
-        title = self.font_large.render("Halftime Game 🏀", True, (0, 0, 0))
-        self.screen.blit(title, (20, 20))
+        draws.append((self._title_surf, self._title_pos))
         
         # Draw score
-        score = self.score_tally
-        if score['total'] > 0:
-            percentage = (score['correct'] / score['total']) * 100
-            score_text = f"Score: {score['correct']}/{score['total']} ({percentage:.1f}%)"
+        if self.score_total > 0:
+            percentage = (self.score_correct / self.score_total) * 100
+            score_text = f"Score: {self.score_correct}/{self.score_total} ({percentage:.1f}%)"
         else:
             score_text = "Score: 0/0"
-        score_surface = self.font_medium.render(score_text, True, (0, 0, 0))
-        self.screen.blit(score_surface, (20, 80))
+        score_surface = self._render(self.font_medium, score_text, (0, 0, 0))
+        draws.append((score_surface, (20, 80)))
         
         # Draw progress
         progress_text = f"Game {self.current_game_index + 1} of {len(self.game_ids)}"
-        progress_surface = self.font_small.render(progress_text, True, (100, 100, 100))
-        self.screen.blit(progress_surface, (20, 120))
+        progress_surface = self._render(self.font_small, progress_text, (100, 100, 100))
+        draws.append((progress_surface, (20, 120)))
         
         # Draw plot image
-        img = self.cached_images.get(current_game_id)
-        if img:
-            # Scale image to fit screen (maintain aspect ratio)
-            img_width, img_height = img.get_size()
-            scale = min((WINDOW_WIDTH - 40) / img_width, (WINDOW_HEIGHT - 200) / img_height)
-            new_width = int(img_width * scale)
-            new_height = int(img_height * scale)
-            scaled_img = pygame.transform.scale(img, (new_width, new_height))
-            
-            # Center image
-            x_offset = (WINDOW_WIDTH - new_width) // 2
-            y_offset = 160
-            self.screen.blit(scaled_img, (x_offset, y_offset))
+        cached = self._get_image(current_game_id)
+        if cached:
+            # Image was pre-scaled and positioned at load time
+            scaled_img, x_offset, y_offset = cached
+            draws.append((scaled_img, (x_offset, y_offset)))
         else:
-            error_text = self.font_medium.render(f"Plot not found for game {current_game_id}", True, (200, 0, 0))
-            self.screen.blit(error_text, (20, 200))
+            error_text = self._render(self.font_medium, f"Plot not found for game {current_game_id}", (200, 0, 0))
+            draws.append((error_text, (20, 200)))
         
         # Draw prediction buttons or result
-        if not game_state['prediction_made']:
-            # Draw buttons
-            button_y = WINDOW_HEIGHT - 100
-            button_width = 200
-            button_height = 60
+        if not game_state.prediction_made:
+            # Buttons are drawn over the image, so flush what we have so far
+            self._blit_many(draws)
+            draws = []
             
             # Slow button (left)
-            slow_rect = pygame.Rect(WINDOW_WIDTH // 2 - 220, button_y, button_width, button_height)
-            pygame.draw.rect(self.screen, (200, 100, 100), slow_rect)
-            pygame.draw.rect(self.screen, (0, 0, 0), slow_rect, 3)
-            slow_text = self.font_medium.render("🐌 Slow (←)", True, (255, 255, 255))
-            text_rect = slow_text.get_rect(center=slow_rect.center)
-            self.screen.blit(slow_text, text_rect)
+            pygame.draw.rect(self.screen, (200, 100, 100), self._slow_rect)
+            pygame.draw.rect(self.screen, (0, 0, 0), self._slow_rect, 3)
+            draws.append((self._slow_label_surf, self._slow_label_pos))
             
             # Fast button (right)
-            fast_rect = pygame.Rect(WINDOW_WIDTH // 2 + 20, button_y, button_width, button_height)
-            pygame.draw.rect(self.screen, (100, 200, 100), fast_rect)
-            pygame.draw.rect(self.screen, (0, 0, 0), fast_rect, 3)
-            fast_text = self.font_medium.render("⚡ Fast (→)", True, (255, 255, 255))
-            text_rect = fast_text.get_rect(center=fast_rect.center)
-            self.screen.blit(fast_text, text_rect)
+            pygame.draw.rect(self.screen, (100, 200, 100), self._fast_rect)
+            pygame.draw.rect(self.screen, (0, 0, 0), self._fast_rect, 3)
+            draws.append((self._fast_label_surf, self._fast_label_pos))
             
             # Instructions
-            inst_text = self.font_small.render("Press ← for Slow, → for Fast", True, (100, 100, 100))
-            self.screen.blit(inst_text, (WINDOW_WIDTH // 2 - 150, button_y - 30))
+            draws.append((self._instructions_surf, self._instructions_pos))
         else:
             # Show result (only after 100ms delay)
-            if game_state['correctness'] is not None and residual_data:
-                result_show_time = game_state.get('result_show_time', 0)
+            if game_state.correctness is not None:
+                result_show_time = game_state.result_show_time
                 current_time = pygame.time.get_ticks()
                 
                 if current_time >= result_show_time:
-                    p_value_p2 = residual_data.get('p_value_p2', 0.5)
-                    actual_result = "slower" if p_value_p2 > 0.5 else "faster"
+                    actual_result = "slower" if game_state.actual_result == "slow" else "faster"
                     
-                    if game_state['correctness']:
+                    if game_state.correctness:
                         result_text = f"✅ Correct! 2H went {actual_result}"
                         color = (0, 150, 0)
                     else:
                         result_text = f"❌ Incorrect. 2H went {actual_result}"
                         color = (200, 0, 0)
                     
-                    result_surface = self.font_medium.render(result_text, True, color)
+                    result_surface = self._render(self.font_medium, result_text, color)
                     text_rect = result_surface.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 50))
-                    self.screen.blit(result_surface, text_rect)
+                    draws.append((result_surface, text_rect))
         
-        # Draw flash overlay if active
+        # Draw flash overlay if active (expiry is handled by _update_timers)
         if self.flash_active:
-            elapsed = pygame.time.get_ticks() - self.flash_start_time
-            if elapsed < FLASH_DURATION_MS:
-                # Create semi-transparent overlay
-                flash_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-                flash_surface.set_alpha(38)  # ~15% opacity (38/255)
-                flash_surface.fill(self.flash_color)
-                self.screen.blit(flash_surface, (0, 0))
-            else:
-                self.flash_active = False
+            draws.append((self._flash_surfs[self.flash_color], (0, 0)))
+        
+        self._blit_many(draws)
+        return dirty_rects
     
     def run(self):
-        """Main game loop."""
-        clock = pygame.time.Clock()
+        """Main game loop.
+        
+        Blocks on the event queue instead of polling at a fixed frame rate:
+        the loop wakes for input or when a timed UI change (flash end,
+        result reveal, auto-advance) is due.
+        """
         running = True
         
         while running:
-            for event in pygame.event.get():
+            # A timeout yields a NOEVENT, which falls through the handlers below
+            events = [pygame.event.wait(self._next_wait_ms())]
+            events.extend(pygame.event.get())
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                 
@@ -302,27 +539,20 @@ class HalftimeGame:
                 
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:  # Left click
-                        mouse_pos = pygame.mouse.get_pos()
-                        button_y = WINDOW_HEIGHT - 100
-                        
-                        # Check if clicked on Slow button
-                        if WINDOW_WIDTH // 2 - 220 <= mouse_pos[0] <= WINDOW_WIDTH // 2 - 20:
-                            if button_y <= mouse_pos[1] <= button_y + 60:
-                                self._handle_prediction("slow")
-                        
-                        # Check if clicked on Fast button
-                        elif WINDOW_WIDTH // 2 + 20 <= mouse_pos[0] <= WINDOW_WIDTH // 2 + 220:
-                            if button_y <= mouse_pos[1] <= button_y + 60:
-                                self._handle_prediction("fast")
+                        # Hit-test the click position against the same rects the buttons are drawn with
+                        if self._slow_rect.collidepoint(event.pos):
+                            self._handle_prediction("slow")
+                        elif self._fast_rect.collidepoint(event.pos):
+                            self._handle_prediction("fast")
                 
-                elif event.type == pygame.USEREVENT:
-                    # Auto-advance to next game
-                    self._advance_to_next_game()
-                    pygame.time.set_timer(pygame.USEREVENT, 0)  # Cancel timer
+                elif event.type == pygame.VIDEOEXPOSE:
+                    # Window contents were lost (e.g. restored from minimized)
+                    self._mark_dirty()
             
-            self._draw()
-            pygame.display.flip()
-            clock.tick(60)  # 60 FPS
+            # Only redraw when something changed, and only push changed regions
+            self._update_timers()
+            if self._dirty_rects:
+                pygame.display.update(self._draw())
         
         pygame.quit()
         sys.exit()
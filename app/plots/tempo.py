@@ -1,25 +1,26 @@
 """Tempo visualization plot"""
+import math
 import sys
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from typing import Optional, Tuple, Dict
+from matplotlib.figure import Figure
+from typing import Optional, Sequence, Tuple, Dict
+from app.data.bigquery_loader import calculate_expected_tfs
 from app.tfs.change_points import find_change_points
 from app.tfs.segments import get_segment_lines
 from app.util.kernel import gaussian_kernel_smoother
 from app.util.style import get_plot_style, get_color, get_poss_start_color
 
-# Try to import scipy.stats, fallback to simple approximation if not available
+# Try to import scipy's normal CDF ufunc, fallback to simple approximation if not available
 try:
-    from scipy import stats
-    HAS_SCIPY = True
+    from scipy.special import ndtr
 except ImportError:
-    HAS_SCIPY = False
     # Simple approximation of normal CDF using error function
-    import math
     def norm_cdf_approx(z):
         """Approximate normal CDF using error function."""
         return 0.5 * (1 + math.erf(z / math.sqrt(2)))
+    # Vectorized so it also accepts arrays, like the scipy ufunc
+    ndtr = np.vectorize(norm_cdf_approx, otypes=[float])
 
 
 # Standard deviations by period and possession start type (estimated - should be updated with actual values)
@@ -39,6 +40,60 @@ STD_DEVS = {
     }
 }
 
+# Possession start types tracked in the residual breakdowns ("other" catches the rest)
+POSS_TYPES = ["rebound", "turnover", "oppo_made_shot", "oppo_made_ft", "other"]
+POSS_TYPE_IDX = {poss_type: i for i, poss_type in enumerate(POSS_TYPES)}
+
+# STD_DEVS as a (period, type) array indexed by [period - 1, POSS_TYPE_IDX[type]]
+# Types without their own entry ("other") use the rebound std dev
+STD_DEV_ARR = np.array([
+    [STD_DEVS[period].get(poss_type, STD_DEVS[period]["rebound"]) for poss_type in POSS_TYPES]
+    for period in (1, 2)
+])
+
+# Short labels for the residual stats text, and row labels/order for the residual table
+TYPE_LABELS = {
+    "rebound": "Reb",
+    "turnover": "TO",
+    "oppo_made_shot": "Made",
+    "oppo_made_ft": "FT",
+    "other": "Other"
+}
+TYPE_LABELS_DISPLAY = {
+    "oppo_made_shot": "Made Shot",
+    "oppo_made_ft": "Made FT",
+    "rebound": "Rebound",
+    "turnover": "Turnover"
+}
+TABLE_POSS_TYPES = ("oppo_made_shot", "oppo_made_ft", "rebound", "turnover")
+# Residual table columns: ONLY Period 1 (P2 and Game-level are hidden to prevent cheating)
+TABLE_COL_LABELS = ("Metric", "P1 Cnt", "P1 Mean", "P1 Med", "P1 Slow%", "P1 P-val")
+
+# Subplot margins for the plot + residual table figure. The layout does not vary between
+# games, so these are what fig.tight_layout() settles on for the standard figsize
+TABLE_FIGURE_LAYOUT = {"left": 0.0783, "right": 0.9813, "top": 0.8885, "bottom": 0.0288, "hspace": 0.4587}
+
+
+def _fast_median(values: np.ndarray) -> float:
+    """Median of a 1-D array using a single np.partition.
+    
+    Same result as np.median (NaN if any value is NaN) without its generic
+    axis handling, which dominates on the small per-type residual arrays.
+    
+    Args:
+        values: Non-empty 1-D array
+        
+    Returns:
+        Median value
+    """
+    if np.isnan(values).any():
+        return np.nan
+    k = values.size // 2
+    if values.size % 2:
+        return np.partition(values, k)[k]
+    part = np.partition(values, (k - 1, k))
+    return (part[k - 1] + part[k]) / 2
+
 
 def calculate_p_value(mean_residual: float, n: int, std_dev: float) -> float:
     """Calculate p-value for mean residual, formatted for display.
@@ -65,25 +120,39 @@ def calculate_p_value(mean_residual: float, n: int, std_dev: float) -> float:
     z = mean_residual / se
     
     # Calculate p-values based on direction
-    if HAS_SCIPY:
-        if mean_residual > 0:
-            # Slow game: P_slower = P(Z > z), display 1 - P_slower (higher = more likely slow)
-            p_slower = 1 - stats.norm.cdf(z)
-            return 1 - p_slower
-        else:
-            # Fast game: P_faster = P(Z < z), display P_faster directly (lower = more likely fast)
-            p_faster = stats.norm.cdf(z)
-            return p_faster
+    if mean_residual > 0:
+        # Slow game: P_slower = P(Z > z), display 1 - P_slower (higher = more likely slow)
+        p_slower = 1 - ndtr(z)
+        return 1 - p_slower
     else:
-        # Use approximation if scipy not available
-        if mean_residual > 0:
-            # Slow game
-            p_slower = 1 - norm_cdf_approx(z)
-            return 1 - p_slower
-        else:
-            # Fast game
-            p_faster = norm_cdf_approx(z)
-            return p_faster
+        # Fast game: P_faster = P(Z < z), display P_faster directly (lower = more likely fast)
+        p_faster = ndtr(z)
+        return p_faster
+
+
+def calculate_p_values(mean_residuals, ns, std_devs) -> np.ndarray:
+    """Vectorized calculate_p_value over many groups with a single ndtr call.
+    
+    Args:
+        mean_residuals: Mean residual per group
+        ns: Sample size per group
+        std_devs: Population standard deviation per group
+        
+    Returns:
+        Array of p-values, in the same display convention as calculate_p_value
+    """
+    mean_residuals = np.asarray(mean_residuals, dtype=float)
+    ns = np.asarray(ns, dtype=float)
+    std_devs = np.asarray(std_devs, dtype=float)
+    
+    # Default to 50% if no data
+    p_values = np.full(mean_residuals.shape, 0.5)
+    has_data = (ns != 0) & (std_devs != 0)
+    
+    # z-score of the mean (expected mean is 0); both directions display the lower-tail CDF
+    z = mean_residuals[has_data] / (std_devs[has_data] / np.sqrt(ns[has_data]))
+    p_values[has_data] = ndtr(z)
+    return p_values
 
 
 def get_std_dev(period: int, poss_start_type: Optional[str], std_devs: Optional[Dict] = None) -> float:
@@ -98,7 +167,10 @@ def get_std_dev(period: int, poss_start_type: Optional[str], std_devs: Optional[
         Standard deviation
     """
     if std_devs is None:
-        std_devs = STD_DEVS
+        type_idx = POSS_TYPE_IDX.get(poss_start_type)
+        if type_idx is None:
+            type_idx = POSS_TYPE_IDX.get(str(poss_start_type).lower(), 0) if poss_start_type else 0
+        return STD_DEV_ARR[0 if period == 1 else 1, type_idx]
     
     period_key = 1 if period == 1 else 2
     poss_type = str(poss_start_type).lower() if poss_start_type else "rebound"
@@ -107,11 +179,11 @@ def get_std_dev(period: int, poss_start_type: Optional[str], std_devs: Optional[
     return std_devs.get(period_key, {}).get(poss_type, std_devs.get(period_key, {}).get("rebound", 8.5))
 
 
-def calculate_combined_p_value(residuals_by_type: Dict[str, list], period: int, std_devs: Optional[Dict] = None) -> float:
+def calculate_combined_p_value(residuals_by_type: Dict[str, Sequence[float]], period: int, std_devs: Optional[Dict] = None) -> float:
     """Calculate combined p-value for overall game considering all possession types.
     
     Args:
-        residuals_by_type: Dictionary mapping poss_start_type to list of residuals
+        residuals_by_type: Dictionary mapping poss_start_type to list (or array) of residuals
         period: Period number (1 or 2)
         std_devs: Optional dictionary of std devs
         
@@ -127,10 +199,10 @@ def calculate_combined_p_value(residuals_by_type: Dict[str, list], period: int,
     combined_variance = 0
     
     for poss_type, res_list in residuals_by_type.items():
-        if not res_list:
+        n = len(res_list)
+        if n == 0:
             continue
         
-        n = len(res_list)
         mean_res = np.mean(res_list)
         std_dev = get_std_dev(period, poss_type, std_devs)
         
@@ -190,8 +262,9 @@ def build_tempo_figure(
     opening_2h_spread: Optional[float] = None,
     closing_2h_spread: Optional[float] = None,
     show_period_2: bool = False,
-    hide_period_2_overlay: bool = False
-) -> Tuple[plt.Figure, Optional[Dict]]:
+    hide_period_2_overlay: bool = False,
+    residuals_only: bool = False
+) -> Tuple[Optional[Figure], Optional[Dict]]:
     """Build tempo visualization figure.
     
     Args:
@@ -213,19 +286,29 @@ def build_tempo_figure(
         closing_2h_spread: Closing 2H spread (optional)
         show_period_2: Whether to show Period 2 data (default: False - only show Period 1)
         hide_period_2_overlay: DEPRECATED - no longer used (kept for compatibility)
+        residuals_only: Compute residual_data only and skip building the figure (returned as None)
         
     Returns:
-        Tuple of (Matplotlib figure, residual_data dictionary or None)
+        Tuple of (Matplotlib figure or None, residual_data dictionary or None)
         Note: residual_data includes full game stats (P1 + P2) even if plot shows only P1
     """
-    # Store full dataframe for residual calculations (need P2 stats for correctness)
-    full_tfs_df = tfs_df.copy()
+    # Full dataframe for residual calculations (need P2 stats for correctness)
+    # Only read from here on, so no defensive copies are taken
+    full_tfs_df = tfs_df
+    
+    # Probe the optional columns once
+    columns = frozenset(full_tfs_df.columns)
+    has_period = "period_number" in columns
+    has_poss_type = "poss_start_type" in columns
+    has_scores = {"away_score", "home_score"} <= columns
     
     # Filter to Period 1 only for display
-    if "period_number" in full_tfs_df.columns:
-        display_tfs_df = full_tfs_df[full_tfs_df["period_number"] == 1].copy()
+    if has_period:
+        display_mask = (full_tfs_df["period_number"] == 1).to_numpy()
+        display_tfs_df = full_tfs_df[display_mask]
     else:
-        display_tfs_df = full_tfs_df.copy()
+        display_mask = np.ones(len(full_tfs_df), dtype=bool)
+        display_tfs_df = full_tfs_df
     
     # Validate that we have Period 1 data
     if len(display_tfs_df) == 0:
@@ -239,227 +322,166 @@ def build_tempo_figure(
         header = f"{header} [{game_status}]"
     
     # Use Period 1 data only for plotting
-    x = display_tfs_df["chrono_index"].values.astype(float)
-    y = display_tfs_df["action_time"].values.astype(float)
+    x = full_tfs_df["chrono_index"].to_numpy(dtype=float)[display_mask]
+    y = full_tfs_df["action_time"].to_numpy(dtype=float)[display_mask]
     
     # Validate arrays are not empty
     if len(x) == 0 or len(y) == 0:
         raise ValueError(f"Empty Period 1 arrays for game {game_id}. x length: {len(x)}, y length: {len(y)}")
     
-    # Create smooth grid (only for Period 1)
-    if len(x) > 0:
-        grid = np.linspace(x.min(), x.max(), 200)
-        gx, gy = gaussian_kernel_smoother(x, y, bandwidth=5, grid=grid)
-    else:
-        grid = np.array([])
-        gx = np.array([])
-        gy = np.array([])
-    
-    # Find change points (only for Period 1)
-    cps = find_change_points(y) if len(y) > 0 else []
-    
-    # Get segment lines (only for Period 1)
-    segments = get_segment_lines(display_tfs_df)
-    
-    # Get style
-    style = get_plot_style()
-    
     # Calculate score_diff from Period 1 scores (if available)
     score_diff = None
-    if "away_score" in full_tfs_df.columns and "home_score" in full_tfs_df.columns and "period_number" in full_tfs_df.columns:
-        period_1_data = full_tfs_df[full_tfs_df["period_number"] == 1]
-        if len(period_1_data) > 0:
-            # Get max scores from period 1
-            max_away_score = period_1_data["away_score"].max()
-            max_home_score = period_1_data["home_score"].max()
-            if pd.notna(max_away_score) and pd.notna(max_home_score):
-                score_diff = abs(float(max_away_score) - float(max_home_score))
+    if has_scores and has_period:
+        # Get max scores from period 1 (display_mask selects the Period 1 rows), ignoring missing values
+        away_p1 = full_tfs_df["away_score"].to_numpy(dtype=float, na_value=np.nan)[display_mask]
+        home_p1 = full_tfs_df["home_score"].to_numpy(dtype=float, na_value=np.nan)[display_mask]
+        away_p1 = away_p1[~np.isnan(away_p1)]
+        home_p1 = home_p1[~np.isnan(home_p1)]
+        if away_p1.size and home_p1.size:
+            score_diff = abs(float(away_p1.max()) - float(home_p1.max()))
     
     # Calculate residuals early if we have closing_total (needed for subplot)
     # Use full dataframe for residual calculations (includes Period 1 + Period 2)
     # NOTE: If closing_total is None, we still return a figure but no residual_data
     # This allows plots to be generated even without market data
     residual_data: Optional[Dict] = None
-    if closing_total is not None and len(full_tfs_df) > 0:
+    exp_tfs_p1: Optional[np.ndarray] = None
+    # A missing or non-finite closing total means no market data: skip the residual stats
+    has_closing_total = closing_total is not None and math.isfinite(float(closing_total))
+    if has_closing_total and len(full_tfs_df) > 0:
         try:
-            from app.data.bigquery_loader import calculate_expected_tfs
-            
             # Verify Period 2 data exists in full_tfs_df
-            if "period_number" in full_tfs_df.columns:
+            if has_period:
                 period_2_data = full_tfs_df[full_tfs_df["period_number"] >= 2]
                 if len(period_2_data) == 0:
                     print(f"WARNING: No Period 2 data found in full_tfs_df for game {game_id}. Cannot calculate P2 residual stats.", file=sys.stderr, flush=True)
-            
-            # Calculate residuals for each possession, tracking by period and type
-            residuals = []
-            residuals_p1 = []
-            residuals_p2 = []
-            
-            # Track by type and period
-            residuals_by_type_p1 = {"rebound": [], "turnover": [], "oppo_made_shot": [], "oppo_made_ft": [], "other": []}
-            residuals_by_type_p2 = {"rebound": [], "turnover": [], "oppo_made_shot": [], "oppo_made_ft": [], "other": []}
-            
-            above_exp_count_by_type_p1 = {"rebound": 0, "turnover": 0, "oppo_made_shot": 0, "oppo_made_ft": 0, "other": 0}
-            above_exp_count_by_type_p2 = {"rebound": 0, "turnover": 0, "oppo_made_shot": 0, "oppo_made_ft": 0, "other": 0}
-            total_count_by_type_p1 = {"rebound": 0, "turnover": 0, "oppo_made_shot": 0, "oppo_made_ft": 0, "other": 0}
-            total_count_by_type_p2 = {"rebound": 0, "turnover": 0, "oppo_made_shot": 0, "oppo_made_ft": 0, "other": 0}
-            
-            above_exp_count = 0
-            above_exp_count_p1 = 0
-            above_exp_count_p2 = 0
-            
-            for idx in range(len(full_tfs_df)):
-                actual_tfs = float(full_tfs_df.iloc[idx]["action_time"])
-                poss_type = None
-                period_num = None
-                if "poss_start_type" in full_tfs_df.columns:
-                    poss_type_val = full_tfs_df.iloc[idx]["poss_start_type"]
-                    if pd.notna(poss_type_val) and poss_type_val is not None:
-                        poss_type = str(poss_type_val).lower()
-                if "period_number" in full_tfs_df.columns:
-                    period_num_val = full_tfs_df.iloc[idx]["period_number"]
-                    if pd.notna(period_num_val):
-                        period_num = int(period_num_val)
-                
-                expected_tfs = calculate_expected_tfs(float(closing_total), poss_type, period_num, score_diff)
-                residual = actual_tfs - expected_tfs
-                residuals.append(residual)
-                
-                # Track by period
-                if period_num == 1:
-                    residuals_p1.append(residual)
-                    if residual > 0:
-                        above_exp_count_p1 += 1
-                elif period_num and period_num >= 2:
-                    residuals_p2.append(residual)
-                    if residual > 0:
-                        above_exp_count_p2 += 1
-                
-                # Track by type and period
-                if poss_type in residuals_by_type_p1:
-                    if period_num == 1:
-                        residuals_by_type_p1[poss_type].append(residual)
-                        total_count_by_type_p1[poss_type] += 1
-                        if residual > 0:
-                            above_exp_count_by_type_p1[poss_type] += 1
-                    elif period_num and period_num >= 2:
-                        residuals_by_type_p2[poss_type].append(residual)
-                        total_count_by_type_p2[poss_type] += 1
-                        if residual > 0:
-                            above_exp_count_by_type_p2[poss_type] += 1
-                else:
-                    if period_num == 1:
-                        residuals_by_type_p1["other"].append(residual)
-                        total_count_by_type_p1["other"] += 1
-                        if residual > 0:
-                            above_exp_count_by_type_p1["other"] += 1
-                    elif period_num and period_num >= 2:
-                        residuals_by_type_p2["other"].append(residual)
-                        total_count_by_type_p2["other"] += 1
-                        if residual > 0:
-                            above_exp_count_by_type_p2["other"] += 1
-                
-                # Count above/below (overall)
-                if residual > 0:
-                    above_exp_count += 1
-            
+        
+            # Pull the columns out once; everything below works on the arrays
+            actual_tfs = full_tfs_df["action_time"].to_numpy(dtype=float)
+            if has_poss_type:
+                poss_types = full_tfs_df["poss_start_type"].to_numpy(dtype=object)
+            else:
+                poss_types = np.full(len(full_tfs_df), None, dtype=object)
+            if has_period:
+                period_num = np.trunc(full_tfs_df["period_number"].to_numpy(dtype=float, na_value=np.nan))
+            else:
+                period_num = np.full(len(full_tfs_df), np.nan)
+            is_p1 = period_num == 1
+            is_p2 = period_num >= 2
+        
+            expected = calculate_expected_tfs(float(closing_total), poss_types, period_num, score_diff)
+            residuals = actual_tfs - expected
+            # Period 1 rows in display order, reused for the expected TFS trend line
+            exp_tfs_p1 = expected[display_mask]
+            residuals_p1 = residuals[is_p1]
+            residuals_p2 = residuals[is_p2]
+            above_exp_count = int((residuals > 0).sum())
+            above_exp_count_p1 = int((residuals_p1 > 0).sum())
+            above_exp_count_p2 = int((residuals_p2 > 0).sum())
+        
+            # Group residuals by (type, period) with one stable sort. Type-major ordering keeps each
+            # type's P1 and P2 groups adjacent, so group 2*i is P1 and 2*i + 1 is P2 for POSS_TYPES[i]
+            # Type ids come from the categorical codes, so only the distinct raw values get lowercased;
+            # unrecognised types map to "other", as do missing ones (code -1 hits the trailing entry)
+            poss_cat = pd.Categorical(poss_types)
+            code_to_type_id = np.array(
+                [POSS_TYPE_IDX.get(str(c).lower(), POSS_TYPE_IDX["other"]) for c in poss_cat.categories]
+                + [POSS_TYPE_IDX["other"]],
+                dtype=np.intp,
+            )
+            type_id = code_to_type_id[poss_cat.codes]
+            in_half = is_p1 | is_p2
+            group_id = (type_id * 2 + is_p2)[in_half]
+            half_res = residuals[in_half]
+            n_groups = 2 * len(POSS_TYPES)
+            counts = np.bincount(group_id, minlength=n_groups)
+            group_sums = np.bincount(group_id, weights=half_res, minlength=n_groups)
+            group_above = np.bincount(group_id, weights=half_res > 0, minlength=n_groups)
+            # Residuals sorted by group for the medians and per-type lists; group g spans bounds[g]:bounds[g + 1]
+            grouped_res = half_res[np.argsort(group_id, kind="stable")]
+            bounds = np.concatenate(([0], np.cumsum(counts)))
+        
+            # Per-group views into grouped_res (no per-type copies); game-level spans both halves
+            residuals_by_type_p1 = {}
+            residuals_by_type_p2 = {}
+            residuals_by_type = {}
+            # (avg, median, pct_above, count) dicts for P1, P2 and overall (game)
+            type_stats_p1 = ({}, {}, {}, {})
+            type_stats_p2 = ({}, {}, {}, {})
+            type_stats = ({}, {}, {}, {})
+            for i, poss_key in enumerate(POSS_TYPES):
+                residuals_by_type_p1[poss_key] = grouped_res[bounds[2 * i]:bounds[2 * i + 1]]
+                residuals_by_type_p2[poss_key] = grouped_res[bounds[2 * i + 1]:bounds[2 * i + 2]]
+                residuals_by_type[poss_key] = grouped_res[bounds[2 * i]:bounds[2 * i + 2]]
+                for lo, hi, (avg_d, median_d, pct_d, count_d) in (
+                    (2 * i, 2 * i + 1, type_stats_p1),
+                    (2 * i + 1, 2 * i + 2, type_stats_p2),
+                    (2 * i, 2 * i + 2, type_stats),
+                ):
+                    n = int(counts[lo:hi].sum())
+                    if n:
+                        avg_d[poss_key] = group_sums[lo:hi].sum() / n
+                        median_d[poss_key] = _fast_median(grouped_res[bounds[lo]:bounds[hi]])
+                        pct_d[poss_key] = group_above[lo:hi].sum() / n * 100
+                        count_d[poss_key] = n
+            avg_by_type_p1, median_by_type_p1, pct_above_by_type_p1, count_by_type_p1 = type_stats_p1
+            avg_by_type_p2, median_by_type_p2, pct_above_by_type_p2, count_by_type_p2 = type_stats_p2
+            avg_by_type, median_by_type, pct_above_by_type, count_by_type = type_stats
+        
             # Calculate overall statistics
-            avg_residual = np.mean(residuals) if residuals else 0.0
-            median_residual = np.median(residuals) if residuals else 0.0
+            avg_residual = np.mean(residuals) if residuals.size else 0.0
+            median_residual = _fast_median(residuals) if residuals.size else 0.0
             total_poss = len(residuals)
             pct_above = (above_exp_count / total_poss * 100) if total_poss > 0 else 0.0
-            
+        
             # Calculate Period 1 statistics
-            avg_residual_p1 = np.mean(residuals_p1) if residuals_p1 else 0.0
-            median_residual_p1 = np.median(residuals_p1) if residuals_p1 else 0.0
+            avg_residual_p1 = np.mean(residuals_p1) if residuals_p1.size else 0.0
+            median_residual_p1 = _fast_median(residuals_p1) if residuals_p1.size else 0.0
             total_poss_p1 = len(residuals_p1)
             pct_above_p1 = (above_exp_count_p1 / total_poss_p1 * 100) if total_poss_p1 > 0 else 0.0
-            
+        
             # Calculate Period 2 statistics
             # CRITICAL: median_residual_p2 is used to determine if user prediction was correct
             # median_residual_p2 > 0 means P2 was SLOWER than expected (user should predict "slow")
             # median_residual_p2 < 0 means P2 was FASTER than expected (user should predict "fast")
-            avg_residual_p2 = np.mean(residuals_p2) if residuals_p2 else 0.0
-            median_residual_p2 = np.median(residuals_p2) if residuals_p2 else 0.0
+            avg_residual_p2 = np.mean(residuals_p2) if residuals_p2.size else 0.0
+            median_residual_p2 = _fast_median(residuals_p2) if residuals_p2.size else 0.0
             total_poss_p2 = len(residuals_p2)
             pct_above_p2 = (above_exp_count_p2 / total_poss_p2 * 100) if total_poss_p2 > 0 else 0.0
-            
+        
             # Validate that we have Period 2 data for correctness calculation
             if total_poss_p2 == 0:
                 print(f"WARNING: No Period 2 residual data calculated for game {game_id}. Cannot determine correctness.", file=sys.stderr, flush=True)
-            
-            # Calculate statistics by type for Period 1
-            avg_by_type_p1 = {}
-            median_by_type_p1 = {}
-            pct_above_by_type_p1 = {}
-            count_by_type_p1 = {}
-            for poss_type, res_list in residuals_by_type_p1.items():
-                if res_list:
-                    avg_by_type_p1[poss_type] = np.mean(res_list)
-                    median_by_type_p1[poss_type] = np.median(res_list)
-                    pct_above_by_type_p1[poss_type] = (above_exp_count_by_type_p1[poss_type] / total_count_by_type_p1[poss_type] * 100) if total_count_by_type_p1[poss_type] > 0 else 0.0
-                    count_by_type_p1[poss_type] = total_count_by_type_p1[poss_type]
-            
-            # Calculate statistics by type for Period 2
-            avg_by_type_p2 = {}
-            median_by_type_p2 = {}
-            pct_above_by_type_p2 = {}
-            count_by_type_p2 = {}
-            for poss_type, res_list in residuals_by_type_p2.items():
-                if res_list:
-                    avg_by_type_p2[poss_type] = np.mean(res_list)
-                    median_by_type_p2[poss_type] = np.median(res_list)
-                    pct_above_by_type_p2[poss_type] = (above_exp_count_by_type_p2[poss_type] / total_count_by_type_p2[poss_type] * 100) if total_count_by_type_p2[poss_type] > 0 else 0.0
-                    count_by_type_p2[poss_type] = total_count_by_type_p2[poss_type]
-            
-            # Calculate overall statistics by type (for backward compatibility)
-            avg_by_type = {}
-            median_by_type = {}
-            pct_above_by_type = {}
-            count_by_type = {}
-            for poss_type in ["rebound", "turnover", "oppo_made_shot", "oppo_made_ft", "other"]:
-                all_res = residuals_by_type_p1.get(poss_type, []) + residuals_by_type_p2.get(poss_type, [])
-                if all_res:
-                    avg_by_type[poss_type] = np.mean(all_res)
-                    median_by_type[poss_type] = np.median(all_res)
-                    total_count = total_count_by_type_p1.get(poss_type, 0) + total_count_by_type_p2.get(poss_type, 0)
-                    above_count = above_exp_count_by_type_p1.get(poss_type, 0) + above_exp_count_by_type_p2.get(poss_type, 0)
-                    pct_above_by_type[poss_type] = (above_count / total_count * 100) if total_count > 0 else 0.0
-                    count_by_type[poss_type] = total_count
-            
+        
             # Calculate p-values
             # Overall p-values
-            p_value_p1 = calculate_combined_p_value(residuals_by_type_p1, period=1) if residuals_p1 else 0.5
-            p_value_p2 = calculate_combined_p_value(residuals_by_type_p2, period=2) if residuals_p2 else 0.5
+            p_value_p1 = calculate_combined_p_value(residuals_by_type_p1, period=1) if residuals_p1.size else 0.5
+            p_value_p2 = calculate_combined_p_value(residuals_by_type_p2, period=2) if residuals_p2.size else 0.5
             p_value_gm = calculate_combined_p_value(
-                {k: residuals_by_type_p1.get(k, []) + residuals_by_type_p2.get(k, []) 
-                 for k in ["rebound", "turnover", "oppo_made_shot", "oppo_made_ft", "other"]},
+                residuals_by_type,
                 period=1  # Use period 1 std devs as default for combined
-            ) if residuals else 0.5
-            
-            # P-values by type for Period 1
+            ) if residuals.size else 0.5
+        
+            # P-values by type for Period 1, Period 2 and overall (game), batched into one call
+            # Game-level groups use period 1 std devs as default for combined
             p_value_by_type_p1 = {}
-            for poss_type, res_list in residuals_by_type_p1.items():
-                if res_list:
-                    std_dev = get_std_dev(1, poss_type)
-                    p_value_by_type_p1[poss_type] = calculate_p_value(np.mean(res_list), len(res_list), std_dev)
-            
-            # P-values by type for Period 2
             p_value_by_type_p2 = {}
-            for poss_type, res_list in residuals_by_type_p2.items():
-                if res_list:
-                    std_dev = get_std_dev(2, poss_type)
-                    p_value_by_type_p2[poss_type] = calculate_p_value(np.mean(res_list), len(res_list), std_dev)
-            
-            # P-values by type overall (game)
             p_value_by_type = {}
-            for poss_type in ["rebound", "turnover", "oppo_made_shot", "oppo_made_ft", "other"]:
-                all_res = residuals_by_type_p1.get(poss_type, []) + residuals_by_type_p2.get(poss_type, [])
-                if all_res:
-                    # Use period 1 std dev as default for combined
-                    std_dev = get_std_dev(1, poss_type)
-                    p_value_by_type[poss_type] = calculate_p_value(np.mean(all_res), len(all_res), std_dev)
-            
+            p_value_groups = [
+                (p_values_d, poss_type, mean_res, counts_d[poss_type], get_std_dev(period, poss_type))
+                for p_values_d, avgs_d, counts_d, period in (
+                    (p_value_by_type_p1, avg_by_type_p1, count_by_type_p1, 1),
+                    (p_value_by_type_p2, avg_by_type_p2, count_by_type_p2, 2),
+                    (p_value_by_type, avg_by_type, count_by_type, 1),
+                )
+                for poss_type, mean_res in avgs_d.items()
+            ]
+            if p_value_groups:
+                _, _, group_means, group_ns, group_stds = zip(*p_value_groups)
+                group_p_values = calculate_p_values(group_means, group_ns, group_stds)
+                for (p_values_d, poss_type, *_), p_val in zip(p_value_groups, group_p_values):
+                    p_values_d[poss_type] = p_val
+        
             residual_data = {
                 # Overall (Game)
                 "avg_residual": avg_residual,
@@ -498,24 +520,50 @@ def build_tempo_figure(
                 "count_by_type_p2": count_by_type_p2,
                 "p_value_by_type_p2": p_value_by_type_p2,
             }
-        except Exception as e:
-            # If calculation fails, skip residual chart
-            import traceback
-            print(f"Error calculating residual statistics: {e}")
-            print(traceback.format_exc())
+        except (ValueError, KeyError) as e:
+            # A failure here only drops the residual table; the plot itself still renders
+            print(f"Error calculating residual statistics for game {game_id}: {e}", file=sys.stderr, flush=True)
+            residual_data = None
+    
+    # The residual stats don't depend on anything below, which only feeds the figure
+    if residuals_only:
+        return None, residual_data
+    
+    # Create smooth grid (only for Period 1)
+    if len(x) > 0:
+        # Smoothing runs in float32: visually identical, half the grid-by-possession working set
+        x_smooth = x.astype(np.float32)
+        grid = np.linspace(x.min(), x.max(), 200, dtype=np.float32)
+        gx, gy = gaussian_kernel_smoother(x_smooth, y.astype(np.float32), bandwidth=5, grid=grid)
+    else:
+        x_smooth = np.array([], dtype=np.float32)
+        grid = np.array([])
+        gx = np.array([])
+        gy = np.array([])
+    
+    # Find change points (only for Period 1)
+    cps = find_change_points(y) if len(y) > 0 else []
+    
+    # Get segment lines (only for Period 1)
+    segments = get_segment_lines(display_tfs_df)
+    
+    # Get style
+    style = get_plot_style()
     
     # Create figure with subplots if we have residual data, otherwise single plot
     if residual_data:
-        fig, axes = plt.subplots(2, 1, figsize=(style["figsize"][0], style["figsize"][1] * 1.3), 
-                                 height_ratios=[3, 1], sharex=False)
+        # Figure directly rather than pyplot: no backend or global figure registry involved
+        fig = Figure(figsize=(style["figsize"][0], style["figsize"][1] * 1.3))
+        axes = fig.subplots(2, 1, height_ratios=[3, 1], sharex=False)
         ax = axes[0]
         ax_residual = axes[1]
     else:
-        fig, ax = plt.subplots(figsize=style["figsize"])
+        fig = Figure(figsize=style["figsize"])
+        ax = fig.subplots()
         ax_residual = None
     
     # Plot raw data with color-coding by poss_start_type
-    if "poss_start_type" in full_tfs_df.columns:
+    if has_poss_type:
         # Group by poss_start_type and plot each group with different color
         # Don't add labels to main legend - they'll be in separate legend
         poss_start_types = ["rebound", "turnover", "oppo_made_shot", "oppo_made_ft", None]
@@ -576,8 +624,7 @@ def build_tempo_figure(
     
     # Calculate game-level expected TFS (flat line for reference)
     game_level_exp_tfs = None
-    if closing_total is not None:
-        from app.data.bigquery_loader import calculate_expected_tfs
+    if has_closing_total:
         # Calculate game-level expected TFS (no poss_start_type)
         game_level_exp_tfs = calculate_expected_tfs(float(closing_total), None)
         
@@ -594,35 +641,10 @@ def build_tempo_figure(
     # Calculate and plot possession-level expected TFS trend
     # Use Period 1 data only for display (matches x and y arrays)
     exp_gx, exp_gy = None, None
-    if closing_total is not None and len(display_tfs_df) > 0:
-        try:
-            # Calculate expected TFS for each possession in Period 1 only
-            # Make sure we iterate in the same order as display_tfs_df (which matches x and y)
-            exp_tfs_values = []
-            for idx in range(len(display_tfs_df)):
-                poss_type = None
-                period_num = 1  # Always Period 1 for display
-                if "poss_start_type" in display_tfs_df.columns:
-                    poss_type_val = display_tfs_df.iloc[idx]["poss_start_type"]
-                    # Handle NaN/None values
-                    if pd.notna(poss_type_val) and poss_type_val is not None:
-                        poss_type = str(poss_type_val).lower()
-                # Use Period 1 score_diff (calculated earlier)
-                exp_tfs = calculate_expected_tfs(float(closing_total), poss_type, period_num, score_diff)
-                exp_tfs_values.append(exp_tfs)
-            
-            exp_tfs_array = np.array(exp_tfs_values)
-            
-            # Smooth the expected TFS trend using the same kernel smoother
-            # Use the same grid points as the kernel curve (Period 1 only)
-            if len(exp_tfs_array) > 0 and len(x) > 0:
-                exp_gx, exp_gy = gaussian_kernel_smoother(x, exp_tfs_array, bandwidth=5, grid=grid)
-        except Exception as e:
-            # If there's an error, fall back to old behavior
-            import traceback
-            print(f"Error calculating possession-level expected TFS: {e}")
-            print(traceback.format_exc())
-            exp_gx, exp_gy = None, None
+    if exp_tfs_p1 is not None and len(exp_tfs_p1) > 0 and len(x) > 0:
+        # Smooth the expected TFS trend using the same kernel smoother
+        # Use the same grid points as the kernel curve (Period 1 only)
+        exp_gx, exp_gy = gaussian_kernel_smoother(x_smooth, exp_tfs_p1.astype(np.float32), bandwidth=5, grid=grid)
     
     # Plot possession-level expected TFS trend and apply shading
     if exp_gx is not None and exp_gy is not None:
@@ -683,6 +705,10 @@ def build_tempo_figure(
     
     # Score overlay removed - don't show scores to game player
     
+    # Coordinate transforms shared by the text annotations below
+    axes_transform = ax.transAxes
+    figure_transform = fig.transFigure
+    
     # Add eFG% annotations if available
     efg_text = []
     if efg_first_half is not None:
@@ -695,7 +721,7 @@ def build_tempo_figure(
         efg_str = " | ".join(efg_text)
         ax.text(
             0.02, 0.98, efg_str,
-            transform=ax.transAxes,
+            transform=axes_transform,
             fontsize=10,
             verticalalignment='top',
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8),
@@ -705,21 +731,13 @@ def build_tempo_figure(
     # Build residual statistics text for display (if needed)
     residual_stats_text = None
     if residual_data:
-        type_labels = {
-            "rebound": "Reb",
-            "turnover": "TO",
-            "oppo_made_shot": "Made",
-            "oppo_made_ft": "FT",
-            "other": "Other"
-        }
-        
         stats_parts = [f"Avg Residual: {residual_data['avg_residual']:+.1f}s"]
         
         # Add by-type residuals
         type_parts = []
         for poss_type in ["rebound", "turnover", "oppo_made_shot", "oppo_made_ft"]:
             if poss_type in residual_data['avg_by_type']:
-                type_parts.append(f"{type_labels[poss_type]}: {residual_data['avg_by_type'][poss_type]:+.1f}s")
+                type_parts.append(f"{TYPE_LABELS[poss_type]}: {residual_data['avg_by_type'][poss_type]:+.1f}s")
         if type_parts:
             stats_parts.append(" | ".join(type_parts))
         
@@ -740,56 +758,47 @@ def build_tempo_figure(
     # Add residual statistics table below if we have residual data
     if ax_residual is not None and residual_data:
         # Prepare data for table with columns: Metric, P1 Count, P2 Count, Gm Count, P1 Mean, P2 Mean, Gm Mean, P1 Median, P2 Median, Gm Median, P1 % Slower, P2 % Slower, Gm % Slower
-        type_labels_display = {
-            "oppo_made_shot": "Made Shot",
-            "oppo_made_ft": "Made FT",
-            "rebound": "Rebound",
-            "turnover": "Turnover"
-        }
-        
         # Build table data: rows are Overall, Made Shot, Made FT, Rebound, Turnover
-        table_data = []
+        # Overall row - ONLY Period 1 stats (hide P2 and Game-level to prevent cheating)
+        # Possession type rows are only added when they have Period 1 data
+        active_types = [poss_type for poss_type in TABLE_POSS_TYPES if residual_data['count_by_type_p1'].get(poss_type, 0) > 0]
         
-        # Helper function to format value or return "-" if not available
-        def fmt_val(val, default="-"):
-            if val is None or (isinstance(val, float) and np.isnan(val)):
-                return default
-            return val
+        # Period 1 metrics as one (row, metric) array: count, mean, median, % slower, p-value
+        # Row 0 is Overall, then one row per active type
+        metrics = np.array(
+            [[
+                residual_data.get('total_poss_p1', 0),
+                residual_data.get('avg_residual_p1', 0),
+                residual_data.get('median_residual_p1', 0),
+                residual_data.get('pct_above_p1', 0),
+                residual_data.get('p_value_p1', 0.5),
+            ]] + [[
+                residual_data['count_by_type_p1'][poss_type],
+                residual_data['avg_by_type_p1'][poss_type],
+                residual_data['median_by_type_p1'][poss_type],
+                residual_data['pct_above_by_type_p1'][poss_type],
+                residual_data.get('p_value_by_type_p1', {}).get(poss_type, 0.5),
+            ] for poss_type in active_types],
+            dtype=float
+        )
+        counts = metrics[:, 0].astype(int)
+        row_labels = ["Overall"] + [TYPE_LABELS_DISPLAY[poss_type] for poss_type in active_types]
         
-        # Overall row - ONLY Period 1 stats (hide P2 and Game-level to prevent cheating)
-        table_data.append([
-            "Overall",
-            str(residual_data.get('total_poss_p1', 0)),
-            f"{residual_data.get('avg_residual_p1', 0):+.1f}s" if residual_data.get('total_poss_p1', 0) > 0 else "-",
-            f"{residual_data.get('median_residual_p1', 0):+.1f}s" if residual_data.get('total_poss_p1', 0) > 0 else "-",
-            f"{residual_data.get('pct_above_p1', 0):.1f}%" if residual_data.get('total_poss_p1', 0) > 0 else "-",
-            f"{residual_data.get('p_value_p1', 0.5)*100:.1f}%" if residual_data.get('total_poss_p1', 0) > 0 else "-"
+        # Format each column in one vectorized pass; "-" where the row has no data (only Overall can be empty)
+        has_data = counts > 0
+        table_data = np.column_stack([
+            row_labels,
+            counts.astype(str),
+            np.where(has_data, np.char.add(np.char.mod('%+.1f', metrics[:, 1]), 's'), '-'),
+            np.where(has_data, np.char.add(np.char.mod('%+.1f', metrics[:, 2]), 's'), '-'),
+            np.where(has_data, np.char.add(np.char.mod('%.1f', metrics[:, 3]), '%'), '-'),
+            np.where(has_data, np.char.add(np.char.mod('%.1f', metrics[:, 4] * 100), '%'), '-'),
         ])
         
-        # Add possession type rows (Made Shot, Made FT, Rebound, Turnover) - ONLY Period 1 stats
-        for poss_type in ["oppo_made_shot", "oppo_made_ft", "rebound", "turnover"]:
-            count_p1 = residual_data['count_by_type_p1'].get(poss_type, 0)
-            
-            if count_p1 > 0:  # Only add row if there's Period 1 data
-                avg_p1 = residual_data['avg_by_type_p1'].get(poss_type, 0.0) if count_p1 > 0 else None
-                median_p1 = residual_data['median_by_type_p1'].get(poss_type, 0.0) if count_p1 > 0 else None
-                pct_p1 = residual_data['pct_above_by_type_p1'].get(poss_type, 0.0) if count_p1 > 0 else None
-                p_val_p1 = residual_data.get('p_value_by_type_p1', {}).get(poss_type, 0.5) if count_p1 > 0 else None
-                
-                table_data.append([
-                    type_labels_display[poss_type],
-                    str(count_p1),
-                    f"{avg_p1:+.1f}s" if avg_p1 is not None else "-",
-                    f"{median_p1:+.1f}s" if median_p1 is not None else "-",
-                    f"{pct_p1:.1f}%" if pct_p1 is not None else "-",
-                    f"{p_val_p1*100:.1f}%" if p_val_p1 is not None else "-"
-                ])
-        
         # Create table with ONLY Period 1 columns (hide P2 and Game-level to prevent cheating)
-        col_labels = ["Metric", "P1 Cnt", "P1 Mean", "P1 Med", "P1 Slow%", "P1 P-val"]
         table = ax_residual.table(
             cellText=table_data,
-            colLabels=col_labels,
+            colLabels=TABLE_COL_LABELS,
             cellLoc='center',
             loc='center',
             bbox=[0, 0, 1, 1]
@@ -801,72 +810,33 @@ def build_tempo_figure(
         table.scale(1, 2)
         
         # Style header row (row 0 in matplotlib table)
-        for j in range(len(col_labels)):
-            table[(0, j)].set_facecolor('#4472C4')
-            table[(0, j)].set_text_props(weight='bold', color='white')
+        cells = table.get_celld()
+        for j in range(len(TABLE_COL_LABELS)):
+            header_cell = cells[(0, j)]
+            header_cell.set_facecolor('#4472C4')
+            header_text = header_cell.get_text()
+            header_text.set_weight('bold')
+            header_text.set_color('white')
         
         # Color code data cells (only Period 1 columns: 0=Metric, 1=Cnt, 2=Mean, 3=Med, 4=Slow%, 5=P-val)
-        for i, row in enumerate(table_data):
-            row_idx = i + 1  # Data rows start at index 1 (after header)
-            
-            # Column 0: Metric column (light gray)
-            table[(row_idx, 0)].set_facecolor('#F0F0F0')
-            
-            # Column 1: P1 Count - white background
-            if len(row) > 1:
-                table[(row_idx, 1)].set_facecolor('#FFFFFF')
-            
-            # Column 2: P1 Mean - color code (red if > 0, green if < 0)
-            if len(row) > 2 and row[2] != "-":
-                try:
-                    val = float(row[2].replace("s", "").replace("+", ""))
-                    if val > 0:
-                        table[(row_idx, 2)].set_facecolor('#ffcccc')  # Light red
-                    else:
-                        table[(row_idx, 2)].set_facecolor('#ccffcc')  # Light green
-                except:
-                    pass
-            
-            # Column 3: P1 Median - color code (red if > 0, green if < 0)
-            if len(row) > 3 and row[3] != "-":
-                try:
-                    val = float(row[3].replace("s", "").replace("+", ""))
-                    if val > 0:
-                        table[(row_idx, 3)].set_facecolor('#ffcccc')  # Light red
-                    else:
-                        table[(row_idx, 3)].set_facecolor('#ccffcc')  # Light green
-                except:
-                    pass
-            
-            # Column 4: P1 Slow% - color code (red if > 50%, green if < 50%)
-            if len(row) > 4 and row[4] != "-":
-                try:
-                    val = float(row[4].replace("%", ""))
-                    if val > 50:
-                        table[(row_idx, 4)].set_facecolor('#ffcccc')  # Light red
-                    else:
-                        table[(row_idx, 4)].set_facecolor('#ccffcc')  # Light green
-                except:
-                    pass
-            
-            # Column 5: P1 P-val - color code (red if > 0.8, green if < 0.2)
-            if len(row) > 5 and row[5] != "-":
-                try:
-                    p_val_text = row[5]
-                    if "%" in p_val_text:
-                        p_val = float(p_val_text.replace("%", "")) / 100.0
-                        if p_val > 0.8:
-                            # High p-value = likely slow - red shading
-                            table[(row_idx, 5)].set_facecolor('#FFE6E6')  # Light red
-                        elif p_val < 0.2:
-                            # Low p-value = likely fast - green shading
-                            table[(row_idx, 5)].set_facecolor('#E6FFE6')  # Light green
-                        else:
-                            table[(row_idx, 5)].set_facecolor('white')
-                    else:
-                        table[(row_idx, 5)].set_facecolor('white')
-                except (ValueError, IndexError):
-                    table[(row_idx, 5)].set_facecolor('white')
+        # Colors follow the values as displayed (to 0.1), so a cell reading "+0.0s" is never colored red.
+        # One column of colors per data column (P-val in percent):
+        # Mean/Med red if > 0 else green, Slow% red if > 50% else green,
+        # P-val red if > 80% (likely slow), green if < 20% (likely fast), else white
+        shown = np.char.mod('%.1f', metrics[:, 1:5] * np.array([1.0, 1.0, 1.0, 100.0])).astype(float)
+        cell_colors = np.column_stack([
+            np.where(shown[:, 0] > 0, '#ffcccc', '#ccffcc'),
+            np.where(shown[:, 1] > 0, '#ffcccc', '#ccffcc'),
+            np.where(shown[:, 2] > 50, '#ffcccc', '#ccffcc'),
+            np.where(shown[:, 3] > 80, '#FFE6E6', np.where(shown[:, 3] < 20, '#E6FFE6', 'white')),
+        ])
+        for row_idx, (count, row_colors) in enumerate(zip(counts, cell_colors), start=1):
+            # Data rows start at index 1 (after header)
+            cells[(row_idx, 0)].set_facecolor('#F0F0F0')  # Metric column (light gray)
+            cells[(row_idx, 1)].set_facecolor('#FFFFFF')  # P1 Count - white background
+            if count > 0:  # Rows without data show "-" and stay uncolored
+                for col_idx, color in enumerate(row_colors, start=2):
+                    cells[(row_idx, col_idx)].set_facecolor(color)
         
         # Remove axes for table
         ax_residual.axis('off')
@@ -879,7 +849,7 @@ def build_tempo_figure(
     elif residual_stats_text:
         ax.text(
             0.5, -0.12, residual_stats_text,
-            transform=ax.transAxes,
+            transform=axes_transform,
             fontsize=9,
             horizontalalignment='center',
             verticalalignment='top',
@@ -899,7 +869,7 @@ def build_tempo_figure(
             color='#0a0a0a',  # Very dark, almost black
             horizontalalignment='left',
             verticalalignment='top',
-            transform=fig.transFigure  # Use figure coordinates
+            transform=figure_transform  # Use figure coordinates
         )
     
     # Add closing total, lookahead 2H total, and spread in top-right above plot
@@ -914,7 +884,7 @@ def build_tempo_figure(
             color='#0a0a0a',
             horizontalalignment='right',
             verticalalignment='top',
-            transform=fig.transFigure
+            transform=figure_transform
         )
         y_pos -= line_height
     
@@ -926,7 +896,7 @@ def build_tempo_figure(
             color='#0a0a0a',
             horizontalalignment='right',
             verticalalignment='top',
-            transform=fig.transFigure
+            transform=figure_transform
         )
         y_pos -= line_height
     
@@ -934,53 +904,29 @@ def build_tempo_figure(
     
     # Add 2H Open/Close/Spread table immediately to the left of the Total/Looka/Spread text
     y_pos_2h = 0.98
-    if opening_2h_total is not None or closing_2h_total is not None or closing_2h_spread is not None:
-        if opening_2h_total is not None:
-            open_str = f"{opening_2h_total:.1f}"
-            if open_str.endswith('.0'):
-                open_str = open_str[:-2]
-            fig.text(
-                0.75, y_pos_2h,
-                f"2H Open: {open_str}",
-                fontsize=9,
-                color='#0a0a0a',
-                horizontalalignment='right',
-                verticalalignment='top',
-                transform=fig.transFigure
-            )
-            y_pos_2h -= line_height
-        
-        if closing_2h_total is not None:
-            close_str = f"{closing_2h_total:.1f}"
-            if close_str.endswith('.0'):
-                close_str = close_str[:-2]
-            fig.text(
-                0.75, y_pos_2h,
-                f"2H Close: {close_str}",
-                fontsize=9,
-                color='#0a0a0a',
-                horizontalalignment='right',
-                verticalalignment='top',
-                transform=fig.transFigure
-            )
-            y_pos_2h -= line_height
-        
-        if closing_2h_spread is not None:
-            spread_2h_str = f"{closing_2h_spread:.1f}"
-            if spread_2h_str.endswith('.0'):
-                spread_2h_str = spread_2h_str[:-2]
-            fig.text(
-                0.75, y_pos_2h,
-                f"2H Spread: {spread_2h_str}",
-                fontsize=9,
-                color='#0a0a0a',
-                horizontalalignment='right',
-                verticalalignment='top',
-                transform=fig.transFigure
-            )
+    entries_2h = [
+        (label, value)
+        for label, value in (("2H Open", opening_2h_total), ("2H Close", closing_2h_total), ("2H Spread", closing_2h_spread))
+        if value is not None
+    ]
+    text_kwargs_2h = dict(
+        fontsize=9,
+        color='#0a0a0a',
+        horizontalalignment='right',
+        verticalalignment='top',
+        transform=figure_transform
+    )
+    for label, value in entries_2h:
+        # One decimal place with a trailing ".0" dropped (70.0 -> "70", 70.5 -> "70.5")
+        fig.text(0.75, y_pos_2h, f"{label}: {round(value, 1):g}", **text_kwargs_2h)
+        y_pos_2h -= line_height
     
     # No overlay needed - plot only shows Period 1 data
     
-    fig.tight_layout()
+    if ax_residual is not None:
+        # Fixed layout: skips tight_layout's measuring pass over every table cell
+        fig.subplots_adjust(**TABLE_FIGURE_LAYOUT)
+    else:
+        fig.tight_layout()
     return fig, residual_data
 
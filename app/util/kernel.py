@@ -20,21 +20,23 @@ def gaussian_kernel_smoother(
     Returns:
         Tuple of (grid, smoothed_y)
     """
-    x = np.asarray(x, dtype=float)
-    y = np.asarray(y, dtype=float)
-    
+    # Work in float32 when all inputs are float32, otherwise float64
     if grid is None:
         grid = x
-    grid = np.asarray(grid, dtype=float)
+    dtype = np.result_type(np.asarray(x), np.asarray(y), np.asarray(grid), np.float32)
+    if not np.issubdtype(dtype, np.floating):
+        dtype = np.float64
+    x = np.asarray(x, dtype=dtype)
+    y = np.asarray(y, dtype=dtype)
+    grid = np.asarray(grid, dtype=dtype)
     
-    smooth = np.zeros_like(grid, dtype=float)
+    # Weights for every (grid point, observation) pair in one broadcast
+    w = np.exp(-0.5 * ((grid[:, None] - x[None, :]) / bandwidth) ** 2)
+    w_sq = w * w
     
-    for i, g in enumerate(grid):
-        w = np.exp(-0.5 * ((g - x) / bandwidth) ** 2)
-        if w.sum() == 0:
-            smooth[i] = np.nan
-        else:
-            smooth[i] = np.sum(w * y * w) / np.sum(w * w)
+    smooth = np.full(grid.shape, np.nan, dtype=dtype)
+    has_weight = w.sum(axis=1) != 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        smooth[has_weight] = (w_sq[has_weight] @ y) / w_sq[has_weight].sum(axis=1)
     
     return grid, smooth
-
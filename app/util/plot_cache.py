@@ -1,25 +1,36 @@
 """Plot caching utilities for fast plot loading"""
 import os
+import sys
 import json
 import pickle
+import subprocess
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Tuple, List, Callable
-import matplotlib.pyplot as plt
-import pandas as pd
-from app.plots.tempo import build_tempo_figure
-from app.data.pbp_loader import load_pbp
-from app.data.status import classify_game_status_pbp
-from app.data.bigquery_loader import get_closing_totals
-from app.data.efg import calculate_efg_by_half
-from app.tfs.preprocess import preprocess_pbp
-from app.tfs.compute import compute_tfs
+from typing import TYPE_CHECKING, Optional, Dict, Tuple, List, Callable, Set
 
+# matplotlib, pandas and the plot pipeline are imported inside generate_plot_for_game,
+# so scripts that only commit or inspect the cache start without loading them
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Try to import orjson for faster metadata (de)serialization, fallback to stdlib json if not available
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Cache directory
 CACHE_DIR = Path("cache/plots")
 CACHE_METADATA_FILE = CACHE_DIR / "metadata.json"
+RESIDUALS_INDEX_FILE = CACHE_DIR / "residuals.json"  # All games' residual data in one file
 CACHE_AGE_HOURS = 24  # Regenerate cache if older than 24 hours
+GIT_ADD_BATCH_SIZE = 500  # Paths per `git add` invocation
+PLOT_DPI = 100
+PLOT_PALETTE_COLORS = 256  # Cached PNGs are saved in palette mode
 
 
 def ensure_cache_dir():
@@ -27,23 +38,56 @@ def ensure_cache_dir():
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _atomic_write(path: Path, data: bytes):
+    """Write data to path via a temp file and rename, so readers never see a partial file.
+    
+    A torn metadata or residual file would otherwise parse as an empty cache.
+    """
+    with tempfile.NamedTemporaryFile('wb', dir=path.parent, prefix=f".{path.name}.", suffix='.tmp', delete=False) as f:
+        f.write(data)
+    try:
+        os.chmod(f.name, 0o644)  # NamedTemporaryFile creates files readable by the owner only
+        os.replace(f.name, path)
+    except:
+        os.unlink(f.name)
+        raise
+
+
+@lru_cache(maxsize=1)
+def _load_cache_metadata(mtime_ns: int, size: int) -> Dict:
+    """Parse metadata.json once per file version (keyed on its mtime and size; failures are not cached)."""
+    if orjson is not None:
+        with open(CACHE_METADATA_FILE, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(CACHE_METADATA_FILE, 'r') as f:
+        return json.load(f)
+
+
 def get_cache_metadata() -> Dict:
-    """Load cache metadata."""
+    """Load cache metadata.
+    
+    Repeat calls reuse the parsed file until it changes on disk.
+    """
     ensure_cache_dir()
-    if CACHE_METADATA_FILE.exists():
-        try:
-            with open(CACHE_METADATA_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+    try:
+        stat = CACHE_METADATA_FILE.stat()
+    except FileNotFoundError:
+        return {}
+    try:
+        # Copy so callers can't modify the memoized dict
+        return dict(_load_cache_metadata(stat.st_mtime_ns, stat.st_size))
+    except:
+        return {}
 
 
 def save_cache_metadata(metadata: Dict):
     """Save cache metadata."""
     ensure_cache_dir()
-    with open(CACHE_METADATA_FILE, 'w') as f:
-        json.dump(metadata, f, indent=2, default=str)
+    if orjson is not None:
+        data = orjson.dumps(metadata, default=str, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(metadata, indent=2, default=str).encode()
+    _atomic_write(CACHE_METADATA_FILE, data)
 
 
 def is_cache_fresh() -> bool:
@@ -60,21 +104,29 @@ def is_cache_fresh() -> bool:
         return False
 
 
-def get_missing_plots(game_ids: List[str]) -> List[str]:
+def list_cache_dir() -> Set[str]:
+    """List the file names in the cache directory with a single directory read.
+    
+    Returns:
+        Set of file names, for O(1) membership tests instead of a stat per file
+    """
+    ensure_cache_dir()
+    return set(os.listdir(CACHE_DIR))
+
+
+def get_missing_plots(game_ids: List[str], cached_names: Optional[Set[str]] = None) -> List[str]:
     """Get list of game IDs that are missing from cache.
     
     Args:
         game_ids: List of game IDs to check
+        cached_names: File names in the cache directory (from list_cache_dir); read if not given
         
     Returns:
         List of game IDs that are missing plots
     """
-    missing = []
-    for game_id in game_ids:
-        plot_path = get_plot_cache_path(game_id)
-        if not plot_path.exists():
-            missing.append(game_id)
-    return missing
+    if cached_names is None:
+        cached_names = list_cache_dir()
+    return [game_id for game_id in game_ids if get_plot_cache_path(game_id).name not in cached_names]
 
 
 def get_all_cached_game_ids() -> List[str]:
@@ -83,19 +135,15 @@ def get_all_cached_game_ids() -> List[str]:
     Returns:
         List of game IDs (unique, extracted from filenames)
     """
-    ensure_cache_dir()
-    game_ids = set()
-    
-    # Find all PNG files (excluding residual data files)
-    for png_file in CACHE_DIR.glob('*.png'):
-        # Skip residual data files
-        if png_file.name.endswith('_residuals.png'):
-            continue
-        # Extract game_id from filename (format: {game_id}.png)
-        name = png_file.stem  # Gets filename without extension
-        game_ids.add(name)
+    # Every PNG is a plot (residual data is stored as .json); listdir returns
+    # plain names, so no Path or DirEntry object is built per directory entry
+    game_ids = {
+        name[:-4]  # Filename format: {game_id}.png
+        for name in list_cache_dir()
+        if name.endswith('.png')
+    }
     
-    return sorted(list(game_ids))
+    return sorted(game_ids)
 
 
 def commit_cache_to_git(dev_mode: bool = True) -> bool:
@@ -107,10 +155,6 @@ def commit_cache_to_git(dev_mode: bool = True) -> bool:
     Returns:
         True if commit was made, False otherwise
     """
-    import subprocess
-    from pathlib import Path
-    import glob
-    
     try:
         # Check if we're in a git repo
         result = subprocess.run(
@@ -122,45 +166,41 @@ def commit_cache_to_git(dev_mode: bool = True) -> bool:
         if result.returncode != 0:
             return False  # Not a git repo
         
-        # Find all PNG files in cache
-        png_files = list(CACHE_DIR.glob('*.png'))
-        if not png_files:
-            return False  # No plots to commit
-        
-        # Check if there are changes to commit
+        # List changed cache files (untracked files individually, not as a collapsed directory)
         result = subprocess.run(
-            ['git', 'status', '--porcelain', 'cache/plots/'],
+            ['git', 'status', '--porcelain', '--untracked-files=all', 'cache/plots/'],
             capture_output=True,
             text=True,
             cwd=Path.cwd()
         )
         
-        if not result.stdout.strip():
-            return False  # No changes
+        # Only new or modified plots need staging; byte-identical ones don't show up here
+        # Porcelain lines are "XY path", with D in XY for deleted files
+        png_paths = [
+            line[3:] for line in result.stdout.splitlines()
+            if line[3:].endswith('.png') and 'D' not in line[:2]
+        ]
+        if not png_paths:
+            return False  # No plot changes
         
         # In dev mode, always commit
         if dev_mode:
-            # Add all PNG files in cache directory (exclude residual data files)
-            png_files = [f for f in CACHE_DIR.glob('*.png') if not f.name.endswith('_residuals.png')]
-            if png_files:
-                # Add all PNG files
-                for png_file in png_files:
-                    subprocess.run(
-                        ['git', 'add', str(png_file)],
-                        cwd=Path.cwd(),
-                        capture_output=True,
-                        check=False
-                    )
+            # Add the changed PNG files, in batches to stay under the argv length limit
+            for start in range(0, len(png_paths), GIT_ADD_BATCH_SIZE):
+                subprocess.run(
+                    ['git', 'add', '--'] + png_paths[start:start + GIT_ADD_BATCH_SIZE],
+                    cwd=Path.cwd(),
+                    capture_output=True,
+                    check=False
+                )
             
-            # Check if anything was staged
+            # Check if anything was staged (exit code 1 means there are staged changes)
             result = subprocess.run(
-                ['git', 'diff', '--cached', '--name-only'],
-                cwd=Path.cwd(),
-                capture_output=True,
-                text=True
+                ['git', 'diff', '--cached', '--quiet'],
+                cwd=Path.cwd()
             )
             
-            if not result.stdout.strip():
+            if result.returncode != 1:
                 return False  # Nothing to commit
             
             # Commit with timestamp
@@ -184,7 +224,6 @@ def commit_cache_to_git(dev_mode: bool = True) -> bool:
         
     except Exception as e:
         print(f"Error committing cache to git: {e}")
-        import traceback
         print(traceback.format_exc())
         return False
 
@@ -201,7 +240,7 @@ def get_plot_cache_path(game_id: str) -> Path:
     return CACHE_DIR / f"{game_id}.png"
 
 
-def save_plot_to_cache(fig: plt.Figure, game_id: str):
+def save_plot_to_cache(fig: 'Figure', game_id: str):
     """Save a plot figure to cache.
     
     Args:
@@ -210,8 +249,21 @@ def save_plot_to_cache(fig: plt.Figure, game_id: str):
     """
     ensure_cache_dir()
     cache_path = get_plot_cache_path(game_id)
-    fig.savefig(cache_path, dpi=100, bbox_inches='tight', format='png')
-    plt.close(fig)  # Close figure to free memory
+    # Figures are built without pyplot, so there is nothing to close; they are freed with the last reference.
+    # The layout already fills the fixed figure size, so bbox_inches='tight' (a second render pass) isn't needed,
+    # and drawing straight onto an Agg canvas skips encoding and re-decoding an intermediate PNG.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from PIL import Image
+
+    canvas = FigureCanvasAgg(fig)
+    fig.set_dpi(PLOT_DPI)
+    canvas.draw()
+    rgb = Image.frombuffer('RGBA', canvas.get_width_height(), canvas.buffer_rgba()).convert('RGB')
+    # Line plots only use a few thousand (mostly anti-aliasing) colours, so a 256-colour palette is visually
+    # lossless and makes the PNG ~3x smaller to store, read and inflate. Pillow writes no Software stamp,
+    # so unchanged plots stay byte-identical across versions.
+    palette = rgb.quantize(colors=PLOT_PALETTE_COLORS, method=Image.MEDIANCUT, dither=Image.NONE)
+    palette.save(cache_path, format='PNG')
 
 
 def load_plot_from_cache(game_id: str) -> Optional[str]:
@@ -231,30 +283,65 @@ def load_plot_from_cache(game_id: str) -> Optional[str]:
 
 def get_residual_data_cache_path(game_id: str) -> Path:
     """Get cache file path for residual data."""
+    return CACHE_DIR / f"{game_id}_residuals.json"
+
+
+def get_legacy_residual_data_cache_path(game_id: str) -> Path:
+    """Get cache file path for residual data written by older versions (pickle)."""
     return CACHE_DIR / f"{game_id}_residuals.pkl"
 
 
 def save_residual_data_to_cache(residual_data: Dict, game_id: str):
-    """Save residual data to cache."""
+    """Save residual data to cache.
+    
+    Residual data is a flat dict of numbers (and per-type dicts of numbers),
+    so it is stored as JSON: faster to load than pickle for small records
+    and safe to read from an untrusted cache directory.
+    """
     ensure_cache_dir()
     cache_path = get_residual_data_cache_path(game_id)
-    with open(cache_path, 'wb') as f:
-        pickle.dump(residual_data, f)
+    # default=float handles numpy scalars that json can't serialize natively
+    _atomic_write(cache_path, json.dumps(residual_data, default=float).encode())
 
 
 def load_residual_data_from_cache(game_id: str) -> Optional[Dict]:
-    """Load residual data from cache."""
+    """Load residual data from cache.
+    
+    Falls back to the legacy pickle file so existing caches still load.
+    """
     cache_path = get_residual_data_cache_path(game_id)
-    if cache_path.exists():
-        try:
-            with open(cache_path, 'rb') as f:
+    legacy_path = get_legacy_residual_data_cache_path(game_id)
+    try:
+        if cache_path.exists():
+            with open(cache_path, 'r') as f:
+                return json.load(f)
+        if legacy_path.exists():
+            with open(legacy_path, 'rb') as f:
                 return pickle.load(f)
-        except Exception as e:
-            print(f"Error loading cached residual data for {game_id}: {e}")
-            return None
+    except Exception as e:
+        print(f"Error loading cached residual data for {game_id}: {e}")
     return None
 
 
+def build_residuals_index() -> Dict[str, Dict]:
+    """Consolidate every cached game's residual data into RESIDUALS_INDEX_FILE.
+    
+    The per-game files stay the source of truth; the index lets readers load
+    all residual data with a single file open instead of one per game.
+    
+    Returns:
+        Dictionary mapping game_id to residual data for games that have it
+    """
+    ensure_cache_dir()
+    residuals = {}
+    for game_id in get_all_cached_game_ids():
+        residual_data = load_residual_data_from_cache(game_id)
+        if residual_data is not None:
+            residuals[game_id] = residual_data
+    _atomic_write(RESIDUALS_INDEX_FILE, json.dumps(residuals, default=float).encode())
+    return residuals
+
+
 def generate_plot_for_game(
     game_id: str,
     closing_total: Optional[float] = None,
@@ -265,8 +352,9 @@ def generate_plot_for_game(
     opening_2h_total: Optional[float] = None,
     closing_2h_total: Optional[float] = None,
     opening_2h_spread: Optional[float] = None,
-    closing_2h_spread: Optional[float] = None
-) -> Tuple[Optional[plt.Figure], Optional[Dict]]:
+    closing_2h_spread: Optional[float] = None,
+    residuals_only: bool = False
+) -> Tuple[Optional['Figure'], Optional[Dict]]:
     """Generate plot for a single game.
     
     Args:
@@ -280,11 +368,19 @@ def generate_plot_for_game(
         closing_2h_total: Closing 2H total
         opening_2h_spread: Opening 2H spread
         closing_2h_spread: Closing 2H spread
+        residuals_only: Only compute residual_data (figure is None), for games whose plot is already cached
         
     Returns:
         Tuple of (figure, residual_data)
         Note: Plot shows only Period 1, but residual_data includes full game stats
     """
+    from app.plots.tempo import build_tempo_figure
+    from app.data.pbp_loader import load_pbp
+    from app.data.status import classify_game_status_pbp
+    from app.data.efg import calculate_efg_by_half
+    from app.tfs.preprocess import preprocess_pbp
+    from app.tfs.compute import compute_tfs
+    
     try:
         # Load and process game data
         raw_pbp = load_pbp(game_id)
@@ -293,6 +389,9 @@ def generate_plot_for_game(
         
         df = preprocess_pbp(raw_pbp)
         tfs_df = compute_tfs(df)
+        if residuals_only:
+            # Status and eFG% only annotate the figure
+            return build_tempo_figure(tfs_df, game_id, closing_total=closing_total, residuals_only=True)
         status = classify_game_status_pbp(raw_pbp)
         efg_1h, efg_2h = calculate_efg_by_half(raw_pbp)
         
@@ -319,10 +418,8 @@ def generate_plot_for_game(
         return fig, residual_data
     except Exception as e:
         # Force flush to ensure error messages appear
-        import sys
         error_msg = f"Error generating plot for game {game_id}: {e}"
         print(error_msg, file=sys.stderr, flush=True)
-        import traceback
         tb = traceback.format_exc()
         print(tb, file=sys.stderr, flush=True)
         # Also print to stdout for visibility
@@ -331,6 +428,35 @@ def generate_plot_for_game(
         return None, None
 
 
+def _init_pregenerate_worker():
+    """Select the non-interactive backend in each worker process."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _pregenerate_game(game_id: str, plot_kwargs: Dict) -> Dict:
+    """Generate and cache one game's plot and residual data (runs in a worker process).
+    
+    Args:
+        game_id: Game identifier
+        plot_kwargs: Keyword arguments for generate_plot_for_game
+        
+    Returns:
+        Status dict with game_id, generated and has_residuals
+    """
+    fig, residual_data = generate_plot_for_game(game_id, **plot_kwargs)
+    if fig is not None:
+        save_plot_to_cache(fig, game_id)
+    # Residual data includes full game stats for correctness calculation
+    if residual_data:
+        save_residual_data_to_cache(residual_data, game_id)
+    return {
+        'game_id': game_id,
+        'generated': fig is not None,
+        'has_residuals': bool(residual_data),
+    }
+
+
 def pregenerate_plots_for_games(
     game_ids: List[str],
     closing_totals: Dict[str, float],
@@ -344,7 +470,8 @@ def pregenerate_plots_for_games(
     closing_2h_spreads: Dict[str, float],
     progress_callback: Optional[Callable[[str, int, int], None]] = None,
     incremental: bool = True,
-    dev_mode: bool = True
+    dev_mode: bool = True,
+    max_workers: Optional[int] = None
 ):
     """Pre-generate and cache plots for all games.
     
@@ -362,12 +489,23 @@ def pregenerate_plots_for_games(
         progress_callback: Optional callback function(game_id, current, total)
         incremental: If True, only generate missing plots. If False, regenerate all.
         dev_mode: If True, auto-commit to git after generation.
+        max_workers: Number of worker processes (defaults to the CPU count).
     """
     ensure_cache_dir()
     
     # If incremental, only process missing games (preserve historical cache)
+    # One directory read answers every existence check below
+    cached_names = list_cache_dir()
     if incremental:
-        games_to_process = get_missing_plots(game_ids)
+        # Also revisit cached plots whose residual data is missing but can be computed (needs a closing total)
+        missing_plots = set(get_missing_plots(game_ids, cached_names))
+        games_to_process = [
+            game_id for game_id in game_ids
+            if game_id in missing_plots or (
+                closing_totals.get(game_id) is not None
+                and get_residual_data_cache_path(game_id).name not in cached_names
+            )
+        ]
     else:
         games_to_process = game_ids
     
@@ -375,50 +513,38 @@ def pregenerate_plots_for_games(
     cached_count = len(game_ids) - total  # Games that were already cached
     generated_count = 0
     
-    for idx, game_id in enumerate(games_to_process):
-        if progress_callback:
-            progress_callback(game_id, idx + 1, total)
-        
-        # Generate plot (Period 1 only)
-        cache_path = get_plot_cache_path(game_id)
-        
-        # Skip if already cached (incremental mode)
-        if incremental and cache_path.exists():
+    jobs = []
+    for game_id in games_to_process:
+        # Plot is cached (incremental mode), so only the residual data needs to be computed
+        plot_cached = incremental and get_plot_cache_path(game_id).name in cached_names
+        if plot_cached:
             cached_count += 1
-            # Still need to check for residual data
-            residual_path = get_residual_data_cache_path(game_id)
-            if not residual_path.exists():
-                # Need to generate to get residual data
-                pass
-            else:
-                continue
-        
-        # Generate plot
-        fig, residual_data = generate_plot_for_game(
-            game_id,
-            closing_total=closing_totals.get(game_id),
-            rotation_number=rotation_numbers.get(game_id),
-            lookahead_2h_total=lookahead_2h_totals.get(game_id),
-            closing_spread_home=closing_spread_home.get(game_id),
-            home_team_name=home_team_names.get(game_id),
-            opening_2h_total=opening_2h_totals.get(game_id),
-            closing_2h_total=closing_2h_totals.get(game_id),
-            opening_2h_spread=opening_2h_spreads.get(game_id),
-            closing_2h_spread=closing_2h_spreads.get(game_id)
-        )
-        
-        if fig is not None:
-            save_plot_to_cache(fig, game_id)
-            generated_count += 1
-            
-            # Save residual data (includes full game stats for correctness calculation)
-            if residual_data:
-                save_residual_data_to_cache(residual_data, game_id)
-        
-        # Residual data should already be saved above, but check if missing
-        residual_path = get_residual_data_cache_path(game_id)
-        if not residual_path.exists() and residual_data:
-            save_residual_data_to_cache(residual_data, game_id)
+        jobs.append((game_id, {
+            'residuals_only': plot_cached,
+            'closing_total': closing_totals.get(game_id),
+            'rotation_number': rotation_numbers.get(game_id),
+            'lookahead_2h_total': lookahead_2h_totals.get(game_id),
+            'closing_spread_home': closing_spread_home.get(game_id),
+            'home_team_name': home_team_names.get(game_id),
+            'opening_2h_total': opening_2h_totals.get(game_id),
+            'closing_2h_total': closing_2h_totals.get(game_id),
+            'opening_2h_spread': opening_2h_spreads.get(game_id),
+            'closing_2h_spread': closing_2h_spreads.get(game_id),
+        }))
+    
+    # Each game is an independent CPU-bound pipeline, so render them in parallel.
+    # Figures can't be pickled back to the parent; workers save them and report a status.
+    done = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_pregenerate_worker) as executor:
+            futures = [executor.submit(_pregenerate_game, game_id, plot_kwargs) for game_id, plot_kwargs in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                done += 1
+                if progress_callback:
+                    progress_callback(result['game_id'], done, total)
+                if result['generated']:
+                    generated_count += 1
     
     # Update metadata
     metadata = {
@@ -429,6 +555,7 @@ def pregenerate_plots_for_games(
         'generated_plots': generated_count
     }
     save_cache_metadata(metadata)
+    build_residuals_index()
     
     # Auto-commit to git in dev mode if plots were generated
     if dev_mode and generated_count > 0:
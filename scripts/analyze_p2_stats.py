@@ -5,61 +5,76 @@ Shows percentages based on different metrics:
 - p_value_p2: < 0.5 = faster, >= 0.5 = slower
 - avg_residual_p2: < 0 = faster, >= 0 = slower
 """
+import json
 import pickle
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 CACHE_DIR = Path("cache/plots")
-residual_files = list(CACHE_DIR.glob("*_residuals.pkl"))
+RESIDUALS_INDEX_FILE = CACHE_DIR / "residuals.json"  # Combined residual data written by generate_cache.py
+RESIDUAL_LOAD_WORKERS = 8  # Threads for reading per-game residual files
 
-# Counters for each metric
-median_faster = 0
-median_slower = 0
-pval_faster = 0
-pval_slower = 0
-avg_faster = 0
-avg_slower = 0
-no_data_count = 0
-total = 0
 
-for pkl_file in residual_files:
+def load_residual_file(residual_file: Path) -> Optional[dict]:
+    """Read one game's residual data file (JSON or legacy pickle), or None on error."""
     try:
-        with open(pkl_file, 'rb') as f:
-            data = pickle.load(f)
-        
-        # Check if we have P2 data
-        median_residual_p2 = data.get('median_residual_p2')
-        p_value_p2 = data.get('p_value_p2')
-        avg_residual_p2 = data.get('avg_residual_p2')
-        
-        if median_residual_p2 is None and p_value_p2 is None:
-            no_data_count += 1
-            continue
-        
-        total += 1
-        
-        # Count by median_residual_p2
-        if median_residual_p2 is not None:
-            if median_residual_p2 < 0:
-                median_faster += 1
-            else:
-                median_slower += 1
-        
-        # Count by p_value_p2
-        if p_value_p2 is not None:
-            if p_value_p2 < 0.5:
-                pval_faster += 1
-            else:
-                pval_slower += 1
-        
-        # Count by avg_residual_p2
-        if avg_residual_p2 is not None:
-            if avg_residual_p2 < 0:
-                avg_faster += 1
-            else:
-                avg_slower += 1
-                
+        if residual_file.suffix == ".json":
+            with open(residual_file, 'r') as f:
+                return json.load(f)
+        with open(residual_file, 'rb') as f:
+            return pickle.load(f)
     except Exception as e:
-        print(f"Error reading {pkl_file}: {e}")
+        print(f"Error reading {residual_file}: {e}")
+        return None
+
+
+# Read every indexed game's residual data with a single file open
+records = {}
+if RESIDUALS_INDEX_FILE.exists():
+    try:
+        with open(RESIDUALS_INDEX_FILE, 'r') as f:
+            records = json.load(f)
+    except Exception as e:
+        print(f"Error reading {RESIDUALS_INDEX_FILE}: {e}")
+        records = {}
+
+# Games missing from the index fall back to their own files
+json_files = list(CACHE_DIR.glob("*_residuals.json"))
+residual_files = [f for f in json_files if f.stem[:-len("_residuals")] not in records]
+# Include legacy pickle files for games that have no JSON sidecar yet
+json_stems = {f.stem for f in json_files}
+residual_files += [
+    f for f in CACHE_DIR.glob("*_residuals.pkl")
+    if f.stem not in json_stems and f.stem[:-len("_residuals")] not in records
+]
+
+# Each file is independent IO, so read them on a small thread pool
+with ThreadPoolExecutor(max_workers=RESIDUAL_LOAD_WORKERS) as executor:
+    for residual_file, data in zip(residual_files, executor.map(load_residual_file, residual_files)):
+        if data is not None:
+            records[residual_file.stem[:-len("_residuals")]] = data
+
+# Games without P2 data have neither a median residual nor a p-value
+metrics = ('median_residual_p2', 'p_value_p2', 'avg_residual_p2')
+rows = [
+    [data.get(metric) for metric in metrics]
+    for data in records.values()
+    if data.get('median_residual_p2') is not None or data.get('p_value_p2') is not None
+]
+total = len(rows)
+no_data_count = len(records) - total
+
+# One column per metric with missing values dropped (NaN compares as not faster, like before)
+thresholds = (0.0, 0.5, 0.0)  # p-value threshold is 0.5, residual thresholds 0
+columns = list(zip(*rows)) if rows else [()] * len(metrics)
+present = [[value for value in column if value is not None] for column in columns]
+median_faster, pval_faster, avg_faster = (
+    sum(value < threshold for value in values) for values, threshold in zip(present, thresholds)
+)
+median_slower, pval_slower, avg_slower = (
+    len(values) - faster for values, faster in zip(present, (median_faster, pval_faster, avg_faster))
+)
 
 print("=" * 60)
 print("Period 2 Residual Statistics Analysis")
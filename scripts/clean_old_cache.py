@@ -2,9 +2,11 @@
 
 Run this script to delete old plot cache files before regenerating with Period 1 only.
 """
+import os
 from pathlib import Path
 
 CACHE_DIR = Path("cache/plots")
+OLD_FORMAT_SUFFIXES = ("_hidden.png", "_visible.png")
 
 def main():
     """Delete old cache files with _hidden or _visible suffixes."""
@@ -12,18 +14,13 @@ def main():
         print("Cache directory does not exist. Nothing to clean.")
         return
     
-    deleted_count = 0
-    
-    # Find and delete old format files
-    for png_file in CACHE_DIR.glob("*_hidden.png"):
-        print(f"Deleting old format: {png_file.name}")
-        png_file.unlink()
-        deleted_count += 1
-    
-    for png_file in CACHE_DIR.glob("*_visible.png"):
-        print(f"Deleting old format: {png_file.name}")
-        png_file.unlink()
-        deleted_count += 1
+    # Find old format files in a single directory scan
+    with os.scandir(CACHE_DIR) as entries:
+        old_files = [entry for entry in entries if entry.name.endswith(OLD_FORMAT_SUFFIXES)]
+    for entry in old_files:
+        print(f"Deleting old format: {entry.name}")
+        os.unlink(entry.path)
+    deleted_count = len(old_files)
     
     print(f"\nDeleted {deleted_count} old cache files.")
     print("You can now run 'python scripts/generate_cache.py' to regenerate plots with Period 1 only.")
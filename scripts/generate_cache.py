@@ -12,10 +12,15 @@ so dates must be within that range.
 """
 import sys
 import os
+import json
+import hashlib
 import warnings
 import logging
+import traceback
 from pathlib import Path
 from datetime import date
+from typing import Optional
+import numpy as np
 import pandas as pd
 
 # Suppress warnings when running outside app context
@@ -27,16 +32,37 @@ sys.stderr.reconfigure(line_buffering=True) if hasattr(sys.stderr, 'reconfigure'
 # Add parent directory to path to import app modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.data.bigquery_loader import get_closing_totals
+from app.data.bigquery_loader import get_closing_totals, closing_totals_to_frame
 from app.util.plot_cache import (
     generate_plot_for_game,
     save_plot_to_cache,
     save_residual_data_to_cache,
-    ensure_cache_dir
+    build_residuals_index,
+    ensure_cache_dir,
+    list_cache_dir,
+    get_plot_cache_path,
+    get_residual_data_cache_path,
+    _atomic_write,
+    CACHE_DIR
 )
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import timezone, timedelta
 
+# Try to import tqdm for a progress bar, fallback to printing a line per game if not available
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+# Try to import orjson for faster scoreboard JSON parsing, fallback to stdlib json if not available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # Date range: 11/1/25 - 11/5/25
 TARGET_DATES = [
@@ -47,6 +73,98 @@ TARGET_DATES = [
     date(2025, 11, 5),
 ]
 
+# Worker processes for plot generation (None = one per CPU)
+GENERATE_WORKERS = None
+
+SCOREBOARD_URL = "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard"
+SCHEDULE_FETCH_WORKERS = 8  # Concurrent scoreboard requests
+SCHEDULE_CACHE_DIR = Path("cache/schedule")  # Scoreboard responses and their ETags, for conditional requests
+
+# One pooled keep-alive session for all ESPN requests, retrying transient server errors
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=SCHEDULE_FETCH_WORKERS,
+    pool_maxsize=SCHEDULE_FETCH_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504]),
+))
+HTTP_SESSION.headers["User-Agent"] = "halftime-cache/1.0"
+
+# Market data each cached game was generated from, so unchanged games can be skipped on re-runs
+INPUT_KEYS_FILE = CACHE_DIR / "input_keys.json"
+GAME_OVER_AFTER_HOURS = 4  # Games this long past tip-off are over, so their PBP no longer changes
+
+# Market data columns passed to generate_plot_for_game as keyword arguments
+PLOT_MARKET_COLUMNS = (
+    "closing_total",
+    "rotation_number",
+    "lookahead_2h_total",
+    "closing_spread_home",
+    "home_team_name",
+    "opening_2h_total",
+    "closing_2h_total",
+    "opening_2h_spread",
+    "closing_2h_spread",
+)
+
+# Residual data saved for games whose residuals can't be computed, so the dashboard doesn't crash
+DUMMY_RESIDUAL = {
+    "median_residual_p2": None,
+    "note": "No market data available - cannot calculate correctness"
+}
+
+
+def get_input_key(plot_kwargs: dict) -> str:
+    """Hash a game's market data inputs into a short cache key."""
+    return hashlib.blake2b(repr(sorted(plot_kwargs.items())).encode(), digest_size=8).hexdigest()
+
+
+def load_input_keys() -> dict:
+    """Load the stored input keys (game_id -> key), or an empty dict if unavailable."""
+    try:
+        with open(INPUT_KEYS_FILE, 'r') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def fetch_scoreboard(datestr: str) -> Optional[dict]:
+    """Fetch the ESPN scoreboard JSON for one date.
+    
+    Responses that carry an ETag are kept in SCHEDULE_CACHE_DIR; later runs send
+    If-None-Match and reuse the stored copy when ESPN answers 304 Not Modified.
+    
+    Args:
+        datestr: Date as YYYYMMDD
+        
+    Returns:
+        Parsed scoreboard JSON, or None if the request failed
+    """
+    params = {"dates": datestr, "groups": "50", "limit": "500"}
+    json_path = SCHEDULE_CACHE_DIR / f"{datestr}.json"
+    etag_path = SCHEDULE_CACHE_DIR / f"{datestr}.etag"
+    try:
+        headers = {}
+        if json_path.exists() and etag_path.exists():
+            headers["If-None-Match"] = etag_path.read_text()
+        resp = HTTP_SESSION.get(SCOREBOARD_URL, params=params, headers=headers, timeout=10)
+        if resp.status_code == 304:
+            content = json_path.read_bytes()
+        else:
+            resp.raise_for_status()
+            content = resp.content
+            etag = resp.headers.get("ETag")
+            if etag:
+                # JSON first: a stale ETag next to new JSON just fails to match next time
+                SCHEDULE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                json_path.write_bytes(content)
+                etag_path.write_text(etag)
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
+    except Exception as e:
+        print(f"Failed to fetch {datestr}: {e}")
+        return None
+
 
 def fetch_schedule_for_dates(target_dates: list) -> pd.DataFrame:
     """Fetch schedule data for specific dates from ESPN API.
@@ -57,37 +175,26 @@ def fetch_schedule_for_dates(target_dates: list) -> pd.DataFrame:
     Returns:
         DataFrame with schedule information
     """
-    url = "https://site.api.espn.com/apis/site/v2/sports/basketball/mens-college-basketball/scoreboard"
-    rows = []
+    # One list per column rather than a dict per event
+    game_ids, game_date_times = [], []
+    away_team_ids, away_teams = [], []
+    home_team_ids, home_teams = [], []
     
     pst = timezone(timedelta(hours=-8))
     
-    for target_date in target_dates:
-        datestr = target_date.strftime("%Y%m%d")
-        params = {"dates": datestr, "groups": "50", "limit": "500"}
-        try:
-            resp = requests.get(url, params=params, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-        except Exception as e:
-            print(f"Failed to fetch {datestr}: {e}")
+    # Fetch all dates concurrently over the shared session; map keeps the results in date order
+    datestrs = [target_date.strftime("%Y%m%d") for target_date in target_dates]
+    with ThreadPoolExecutor(max_workers=SCHEDULE_FETCH_WORKERS) as executor:
+        scoreboards = list(executor.map(fetch_scoreboard, datestrs))
+    
+    for data in scoreboards:
+        if data is None:
             continue
         
         for e in data.get("events", []):
             game_id = e.get("id")
             game_date_time = e.get("date")
             
-            # Convert game_date_time to PST and extract date
-            if game_date_time:
-                try:
-                    dt_utc = pd.to_datetime(game_date_time, utc=True)
-                    dt_pst = dt_utc.tz_convert(pst)
-                    game_date = dt_pst.date()
-                except Exception:
-                    game_date = game_date_time.split("T")[0] if game_date_time else None
-            else:
-                game_date = None
-            
             away_team = home_team = None
             away_team_id = home_team_id = None
             
@@ -102,22 +209,40 @@ def fetch_schedule_for_dates(target_dates: list) -> pd.DataFrame:
                         home_team = comp.get("team", {}).get("location")
                         home_team_id = comp.get("team", {}).get("id")
             
-            rows.append({
-                "game_id": game_id,
-                "game_date": game_date,
-                "game_date_time": game_date_time,
-                "away_team_id": away_team_id,
-                "away_team": away_team,
-                "home_team_id": home_team_id,
-                "home_team": home_team,
-            })
+            game_ids.append(game_id)
+            game_date_times.append(game_date_time)
+            away_team_ids.append(away_team_id)
+            away_teams.append(away_team)
+            home_team_ids.append(home_team_id)
+            home_teams.append(home_team)
+    
+    if not game_ids:
+        return pd.DataFrame()
     
-    return pd.DataFrame(rows)
+    sched = pd.DataFrame({
+        "game_id": game_ids,
+        "game_date": None,  # Filled in below for all rows at once
+        "game_date_time": game_date_times,
+        "away_team_id": away_team_ids,
+        "away_team": away_teams,
+        "home_team_id": home_team_ids,
+        "home_team": home_teams,
+    })
+    
+    # Convert game_date_time to PST and extract date in one vectorized pass;
+    # unparseable times fall back to the date part of the raw string
+    dt_pst = pd.to_datetime(sched["game_date_time"], utc=True, errors="coerce").dt.tz_convert(pst)
+    raw_dates = sched["game_date_time"].str.split("T").str[0]
+    sched["game_date"] = dt_pst.dt.date.where(dt_pst.notna(), raw_dates)
+    return sched
 
 
 def get_game_ids_for_dates(sched: pd.DataFrame, target_dates: list) -> list:
     """Get all game IDs for the target dates.
     
+    Games whose scheduled tip-off is still in the future are skipped: they
+    have no PBP yet, so fetching and plotting them would only fail.
+    
     Args:
         sched: Schedule DataFrame
         target_dates: List of date objects
@@ -126,18 +251,73 @@ def get_game_ids_for_dates(sched: pd.DataFrame, target_dates: list) -> list:
         List of game ID strings
     """
     sched["game_date"] = pd.to_datetime(sched["game_date"], errors="coerce")
-    sched["game_date_only"] = sched["game_date"].dt.date
+    # Day-resolution datetime64 groups in C, without building a date object per row
+    game_days = sched["game_date"].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    
+    # Games with an unknown tip-off time are kept
+    tipoff = pd.to_datetime(sched["game_date_time"], utc=True, errors="coerce")
+    not_started = tipoff > pd.Timestamp.now(tz="UTC")
+    
+    # Keep only rows on a target date with one membership test, then group them by day once
+    # instead of scanning the schedule per target date (row order is kept within a day)
+    target_days = np.array(target_dates, dtype="datetime64[D]")
+    on_target = np.isin(game_days, target_days)
+    not_started = not_started.to_numpy()
+    started = on_target & ~not_started
+    game_ids_by_day = (
+        sched["game_id"].astype(str)[started].groupby(game_days[started]).apply(list).to_dict()
+    )
+    skipped_by_day = pd.Series(not_started[on_target]).groupby(game_days[on_target]).sum().to_dict()
     
     game_ids = []
     for target_date in target_dates:
-        day_games = sched[sched["game_date_only"] == target_date]
-        day_game_ids = day_games["game_id"].astype(str).tolist()
+        day = pd.Timestamp(target_date)
+        day_game_ids = game_ids_by_day.get(day, [])
         game_ids.extend(day_game_ids)
-        print(f"Found {len(day_game_ids)} games for {target_date}")
+        skipped = int(skipped_by_day.get(day, 0))
+        if skipped:
+            print(f"Found {len(day_game_ids)} games for {target_date} (skipping {skipped} not yet started)")
+        else:
+            print(f"Found {len(day_game_ids)} games for {target_date}")
     
     return game_ids
 
 
+def process_game(game_id: str, plot_kwargs: dict) -> tuple:
+    """Generate and cache one game's plot and residual data (runs in a worker process).
+    
+    Args:
+        game_id: Game identifier
+        plot_kwargs: Market data keyword arguments for generate_plot_for_game
+        
+    Returns:
+        Tuple of (game_id, success, status message)
+    """
+    try:
+        # Generate plot (Period 1 only, but residual_data includes full game)
+        fig, residual_data = generate_plot_for_game(game_id, **plot_kwargs)
+        
+        # Allow plots without residual_data (market data may be missing for historical dates)
+        if fig is None:
+            return game_id, False, "FAILED (no plot generated)"
+        
+        # Save plot (Period 1 only)
+        save_plot_to_cache(fig, game_id)
+        
+        # Save residual data (or create dummy if None)
+        if residual_data is not None:
+            save_residual_data_to_cache(residual_data, game_id)
+            return game_id, True, "SUCCESS"
+        
+        # Create dummy residual data file so dashboard doesn't crash
+        save_residual_data_to_cache(DUMMY_RESIDUAL, game_id)
+        # Warn if residual_data is missing but don't fail
+        return game_id, True, f"SUCCESS (WARNING: No residual data for {game_id}, likely missing closing_total)"
+        
+    except Exception as e:
+        return game_id, False, f"FAILED: {e}\n{traceback.format_exc()}"
+
+
 def main():
     """Main cache generation function."""
     print("=" * 60)
@@ -164,7 +344,7 @@ def main():
         print("ERROR: No games found for target dates")
         print(f"Schedule has {len(sched)} total rows")
         if len(sched) > 0:
-            print(f"Sample dates in schedule: {sched['game_date_only'].unique()[:10]}")
+            print(f"Sample dates in schedule: {sched['game_date'].dt.date.unique()[:10]}")
         return
     
     print(f"Found {len(game_ids)} total games")
@@ -191,52 +371,19 @@ def main():
         print("Continuing without market data...")
         closing_totals_raw = {}
     
-    # Build market data dictionaries
-    closing_totals = {}
-    rotation_numbers = {}
-    lookahead_2h_totals = {}
-    closing_spread_home = {}
-    home_team_names = {}
-    opening_2h_totals = {}
-    closing_2h_totals = {}
-    opening_2h_spreads = {}
-    closing_2h_spreads = {}
-    
-    for gid in game_ids:
-        if gid in closing_totals_raw:
-            try:
-                (closing_total, board, rotation_number, closing_1h_total, 
-                 lookahead_2h_total, spread_home, home_team_name, 
-                 opening_2h_total, closing_2h_total, opening_2h_spread, 
-                 closing_2h_spread) = closing_totals_raw[gid]
-                
-                closing_total = float(closing_total)
-                closing_totals[gid] = closing_total
-                
-                if rotation_number is not None:
-                    rotation_numbers[gid] = rotation_number
-                if lookahead_2h_total is not None:
-                    lookahead_2h_totals[gid] = float(lookahead_2h_total)
-                if spread_home is not None:
-                    closing_spread_home[gid] = float(spread_home)
-                if home_team_name:
-                    home_team_names[gid] = home_team_name
-                if opening_2h_total is not None:
-                    opening_2h_totals[gid] = float(opening_2h_total)
-                if closing_2h_total is not None:
-                    closing_2h_totals[gid] = float(closing_2h_total)
-                if opening_2h_spread is not None:
-                    opening_2h_spreads[gid] = float(opening_2h_spread)
-                if closing_2h_spread is not None:
-                    closing_2h_spreads[gid] = float(closing_2h_spread)
-            except Exception as e:
-                print(f"WARNING: Error unpacking market data for game {gid}: {e}")
+    # One row of generate_plot_for_game keyword arguments per game (missing values become None)
+    market = closing_totals_to_frame(closing_totals_raw)
+    market = market.loc[market.index.isin(game_ids), list(PLOT_MARKET_COLUMNS)]
+    market_kwargs = market.astype(object).where(market.notna(), None).to_dict("index")
     
     print()
     
     # Step 4: Filter games to only those with closing totals
     print("Step 4: Filtering games with closing totals...")
-    games_with_totals = [gid for gid in game_ids if gid in closing_totals]
+    games_with_totals = [
+        gid for gid in game_ids
+        if gid in market_kwargs and market_kwargs[gid]["closing_total"] is not None
+    ]
     games_without_totals = len(game_ids) - len(games_with_totals)
     
     if games_without_totals > 0:
@@ -250,64 +397,64 @@ def main():
         print(f"TEST MODE: Processing only first 20 games (out of {len(games_with_totals)})")
         games_with_totals = games_with_totals[:20]
     
+    # Workers receive each game's market data as a plain dict of keyword arguments
+    plot_kwargs = {game_id: market_kwargs[game_id] for game_id in games_with_totals}
+    
+    # Skip finished games whose plot and residual data were generated from the same market data.
+    # Games still in progress are always regenerated since their PBP keeps changing
+    input_keys = {game_id: get_input_key(plot_kwargs[game_id]) for game_id in games_with_totals}
+    stored_keys = load_input_keys()
+    cached_names = list_cache_dir()
+    tipoff = pd.to_datetime(sched.set_index(sched["game_id"].astype(str))["game_date_time"], utc=True, errors="coerce")
+    over_before = pd.Timestamp.now(tz="UTC") - pd.Timedelta(hours=GAME_OVER_AFTER_HOURS)
+    finished = set(tipoff.index[(tipoff < over_before).to_numpy()])
+    games_to_generate = [
+        game_id for game_id in games_with_totals
+        if not (
+            game_id in finished
+            and stored_keys.get(game_id) == input_keys[game_id]
+            and get_plot_cache_path(game_id).name in cached_names
+            and get_residual_data_cache_path(game_id).name in cached_names
+        )
+    ]
+    unchanged = len(games_with_totals) - len(games_to_generate)
+    if unchanged:
+        print(f"Skipping {unchanged} finished games already cached with the same market data")
+    
     successful = 0
     failed = 0
     
-    for idx, game_id in enumerate(games_with_totals, 1):
-        print(f"[{idx}/{len(game_ids)}] Processing game {game_id}...", end=" ", flush=True)
-        
-        try:
-            # Generate plot (Period 1 only, but residual_data includes full game)
-            fig, residual_data = generate_plot_for_game(
-                game_id,
-                closing_total=closing_totals.get(game_id),
-                rotation_number=rotation_numbers.get(game_id),
-                lookahead_2h_total=lookahead_2h_totals.get(game_id),
-                closing_spread_home=closing_spread_home.get(game_id),
-                home_team_name=home_team_names.get(game_id),
-                opening_2h_total=opening_2h_totals.get(game_id),
-                closing_2h_total=closing_2h_totals.get(game_id),
-                opening_2h_spread=opening_2h_spreads.get(game_id),
-                closing_2h_spread=closing_2h_spreads.get(game_id)
-            )
-            
-            # Allow plots without residual_data (market data may be missing for historical dates)
-            if fig is None:
-                print("FAILED (no plot generated)", flush=True)
+    # Games are independent (PBP fetch + render), so process them in parallel.
+    # Output is printed here, in completion order, so lines from different games don't interleave
+    with ProcessPoolExecutor(max_workers=GENERATE_WORKERS) as executor:
+        futures = [executor.submit(process_game, game_id, plot_kwargs[game_id]) for game_id in games_to_generate]
+        completed = as_completed(futures)
+        if tqdm is not None:
+            # One throttled progress bar instead of a flushed line per game
+            completed = tqdm(completed, total=len(futures), mininterval=0.5)
+        for idx, future in enumerate(completed, 1):
+            game_id, ok, message = future.result()
+            if ok:
+                successful += 1
+                if game_id in finished:
+                    stored_keys[game_id] = input_keys[game_id]
+            else:
                 failed += 1
+                stored_keys.pop(game_id, None)
+            if tqdm is None:
+                print(f"[{idx}/{len(games_to_generate)}] Processing game {game_id}... {message}", flush=True, file=sys.stdout if ok else sys.stderr)
                 continue
-            
-            # Warn if residual_data is missing but don't fail
-            if residual_data is None:
-                print(f"WARNING: No residual data for {game_id} (likely missing closing_total)", flush=True)
-            
-            # Save plot (Period 1 only)
-            save_plot_to_cache(fig, game_id)
-            
-            # Save residual data (or create dummy if None)
-            if residual_data is not None:
-                save_residual_data_to_cache(residual_data, game_id)
-            else:
-                # Create dummy residual data file so dashboard doesn't crash
-                import pickle
-                from pathlib import Path
-                dummy_residual = {
-                    "median_residual_p2": None,
-                    "note": "No market data available - cannot calculate correctness"
-                }
-                residual_path = Path("cache/plots") / f"{game_id}_residuals.pkl"
-                residual_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(residual_path, 'wb') as f:
-                    pickle.dump(dummy_residual, f)
-            
-            print("SUCCESS", flush=True)
-            successful += 1
-            
-        except Exception as e:
-            print(f"FAILED: {e}", flush=True, file=sys.stderr)
-            failed += 1
-            import traceback
-            print(traceback.format_exc(), file=sys.stderr, flush=True)
+            completed.set_postfix(ok=successful, fail=failed, refresh=False)
+            if message != "SUCCESS":
+                # Failures and warnings are still reported per game
+                tqdm.write(f"Game {game_id}: {message}", file=sys.stdout if ok else sys.stderr)
+    
+    # Atomic, so an interrupted run can't leave a torn file that would make every game look new
+    _atomic_write(INPUT_KEYS_FILE, json.dumps(stored_keys, indent=2).encode())
+    
+    # Consolidate per-game residual files so the game can load them in one read
+    residuals = build_residuals_index()
+    print(f"Wrote residual index for {len(residuals)} games")
     
     print()
     print("=" * 60)
@@ -1,24 +1,27 @@
 """Wipe all cached plots and residual data"""
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import shutil
 
 CACHE_DIR = Path("cache/plots")
+WIPE_SUFFIXES = (".png", "_residuals.json", ".pkl")  # Plots and per-game residual data (JSON, plus legacy PKL)
+WIPE_FILES = ("residuals.json", "input_keys.json")  # Combined residual index and generation input keys
+DELETE_WORKERS = 16  # Threads issuing unlinks
 
 def main():
     """Delete all cached plots and residual data."""
     if CACHE_DIR.exists():
-        # Delete all PNG and PKL files
-        deleted = 0
-        for file in CACHE_DIR.glob("*.png"):
-            file.unlink()
-            deleted += 1
-        for file in CACHE_DIR.glob("*.pkl"):
-            file.unlink()
-            deleted += 1
-        print(f"Deleted {deleted} cache files")
+        # Find everything to delete in a single directory scan, then unlink on a thread pool
+        with os.scandir(CACHE_DIR) as entries:
+            paths = [
+                entry.path for entry in entries
+                if entry.name.endswith(WIPE_SUFFIXES) or entry.name in WIPE_FILES
+            ]
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            list(executor.map(os.unlink, paths))
+        print(f"Deleted {len(paths)} cache files")
     else:
         print("Cache directory does not exist")
 
 if __name__ == "__main__":
     main()
-
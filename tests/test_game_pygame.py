@@ -0,0 +1,66 @@
+"""Regression checks for loading cached plots in the pygame game.
+
+Run from the repository root with:
+    python -m unittest discover tests
+"""
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Headless SDL so the game window can be created without a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from matplotlib.figure import Figure
+
+import app.game_pygame as game_pygame
+import app.util.plot_cache as plot_cache
+
+
+class DecodeImageTest(unittest.TestCase):
+    """Plots written by save_plot_to_cache must load and scale for display."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        cache_dir = Path(self._tmp.name)
+        for target, name, value in (
+            (plot_cache, "CACHE_DIR", cache_dir),
+            (game_pygame, "CACHE_DIR", cache_dir),
+            (game_pygame, "RESIDUALS_INDEX_FILE", cache_dir / "residuals.json"),
+        ):
+            patcher = mock.patch.object(target, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        fig = Figure(figsize=(8, 5.2))
+        fig.subplots().plot(range(10))
+        plot_cache.save_plot_to_cache(fig, "g1")
+        (cache_dir / "residuals.json").write_text('{"g1": {"p_value_p2": 0.3}}')
+
+    def tearDown(self):
+        pygame.quit()
+        self._tmp.cleanup()
+
+    def test_palette_plot_is_decoded(self):
+        # The cached PNG is palette-mode, so pygame loads it as an 8-bit surface
+        self.assertEqual(pygame.image.load(str(plot_cache.get_plot_cache_path("g1"))).get_bitsize(), 8)
+
+        game = game_pygame.HalftimeGame()
+        # __init__ queues the next game (the only one) for the prefetch thread; wait for it
+        prefetched_id, prefetched = game._prefetch_results.get(timeout=10)
+        self.assertEqual(prefetched_id, "g1")
+        self.assertIsNotNone(prefetched)
+
+        image = game._decode_image("g1")
+        self.assertIsNotNone(image)
+        scaled_img, x_offset, y_offset = image
+        self.assertGreater(scaled_img.get_width(), 800)  # Upscaled into the plot area
+        self.assertGreaterEqual(x_offset, 0)
+        self.assertIsNotNone(game._to_display_format(image))
+
+
+if __name__ == "__main__":
+    unittest.main()